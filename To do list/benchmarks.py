@@ -0,0 +1,350 @@
+"""Micro-benchmarks for the storage and view layers of the to-do apps.
+
+Run from this folder, optionally naming the benchmarks to run:
+
+    python benchmarks.py journal
+"""
+import importlib.util
+import os
+import json
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+CATEGORIES = ["My Day", "Important", "Planned", "Personal", "Work", "Shopping"]
+
+
+def load_app(version):
+    # The app files have spaces in their names, so load them by path
+    path = os.path.join(HERE, f"todo_list_microsoft {version}.py")
+    spec = importlib.util.spec_from_file_location(f"todo_list_{version.replace('.', '_')}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_tasks(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        {
+            "task": f"Task {i}",
+            "due_date": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "priority": rng.choice(["Low", "Normal", "High"]),
+            "category": rng.choice(CATEGORIES),
+            "status": rng.choice(["Pending", "Completed"]),
+            "created_date": "2024-01-01 09:00",
+            "id": i + 1,
+        }
+        for i in range(count)
+    ]
+
+
+def report(label, seconds, runs=1):
+    print(f"  {label:<48} {seconds / runs * 1e6:>12.1f} us")
+
+
+def bench_journal():
+    app = load_app("1.9")
+    print("journal: per-mutation cost, journal append vs full rewrite")
+    for count in (1_000, 10_000, 100_000):
+        with tempfile.TemporaryDirectory() as folder:
+            store = app.JsonTaskStore(
+                os.path.join(folder, "tasks.json"),
+                os.path.join(folder, "tasks.journal"),
+                compact_every=10**9,
+            )
+            tasks = make_tasks(count)
+            store.set_tasks(tasks)
+            store.compact()
+
+            runs = 500
+            start = time.perf_counter()
+            for i in range(runs):
+                task = tasks[i % count]
+                task["status"] = "Completed"
+                store.update(task)
+            report(f"{count:>7} tasks, journal append", time.perf_counter() - start, runs)
+
+            runs = 5
+            start = time.perf_counter()
+            for _ in range(runs):
+                store.compact()
+            report(f"{count:>7} tasks, full rewrite", time.perf_counter() - start, runs)
+
+
+def bench_sqlite():
+    app = load_app("1.9")
+    print("sqlite: category page query and dashboard counts, JSON scan vs SQLite")
+    for count in (10_000, 100_000):
+        with tempfile.TemporaryDirectory() as folder:
+            json_store = app.JsonTaskStore(os.path.join(folder, "tasks.json"), os.path.join(folder, "tasks.journal"))
+            json_store.set_tasks(make_tasks(count))
+            json_store.compact()
+            sqlite_store = app.SQLiteTaskStore(
+                os.path.join(folder, "tasks.db"),
+                os.path.join(folder, "tasks.json"),
+                os.path.join(folder, "tasks.journal"),
+            )
+            start = time.perf_counter()
+            sqlite_store.load()
+            report(f"{count:>7} tasks, sqlite first-run import", time.perf_counter() - start)
+
+            for name, store in (("json", json_store), ("sqlite", sqlite_store)):
+                runs = 20
+                start = time.perf_counter()
+                for _ in range(runs):
+                    store.category_tasks("Shopping")
+                report(f"{count:>7} tasks, {name} category_tasks", time.perf_counter() - start, runs)
+                start = time.perf_counter()
+                for _ in range(runs):
+                    store.category_status_counts()
+                report(f"{count:>7} tasks, {name} category_status_counts", time.perf_counter() - start, runs)
+            sqlite_store.close()
+
+
+def resident_kb():
+    # Current RSS, or None when it can't be read here; ru_maxrss is
+    # inherited from the parent, so it can't be used
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+    if psutil is not None:
+        return psutil.Process().memory_info().rss // 1024
+    if os.path.exists("/proc/self/statm"):
+        with open("/proc/self/statm") as file:
+            return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    return None
+
+
+def rss_growth(before):
+    after = resident_kb()
+    return None if before is None or after is None else after - before
+
+
+def report_rss(result):
+    if result["rss_kb"] is None:
+        print(f"  {'':<48} {'n/a':>12} RSS growth (install psutil)")
+    else:
+        print(f"  {'':<48} {result['rss_kb'] / 1024:>12.1f} MB RSS growth")
+
+
+def open_first_page(kind, folder):
+    # Runs in a child process so only one loader is resident
+    app = load_app("1.9")
+    before = resident_kb()
+    start = time.perf_counter()
+    if kind == "json":
+        store = app.JsonTaskStore(os.path.join(folder, "tasks.json"), os.path.join(folder, "tasks.journal"))
+    else:
+        store = app.BinaryTaskStore(os.path.join(folder, "tasks.bin"), os.path.join(folder, "tasks.bin.journal"))
+    store.load()
+    page = store.category_tasks("My Day")
+    elapsed = time.perf_counter() - start
+    grown = rss_growth(before)
+    print(json.dumps({"seconds": elapsed, "rss_kb": grown}))
+
+
+def bench_binary():
+    app = load_app("1.9")
+    print("binary: open store and build the first category page, JSON vs mmap")
+    for count in (100_000, 500_000):
+        with tempfile.TemporaryDirectory() as folder:
+            json_path = os.path.join(folder, "tasks.json")
+            with open(json_path, "w") as file:
+                json.dump(make_tasks(count), file, indent=4)
+            app.json_to_binary(json_path, os.path.join(folder, "tasks.bin"), os.path.join(folder, "tasks.journal"))
+            for kind, name in (("json", "tasks.json"), ("binary", "tasks.bin")):
+                size = os.path.getsize(os.path.join(folder, name))
+                output = subprocess.run(
+                    [sys.executable, __file__, "--open-first-page", kind, folder],
+                    capture_output=True, text=True, check=True
+                ).stdout
+                result = json.loads(output)
+                report(f"{count:>7} tasks, {kind} open ({size // 1024} KB)", result["seconds"])
+                report_rss(result)
+
+
+def bench_cache():
+    app = load_app("1.9")
+    print("cache: JsonTaskStore.load, cold parse vs warm snapshot cache")
+    for count in (10_000, 100_000):
+        with tempfile.TemporaryDirectory() as folder:
+            json_path = os.path.join(folder, "tasks.json")
+            with open(json_path, "w") as file:
+                json.dump(make_tasks(count), file, indent=4)
+            store = app.JsonTaskStore(json_path, os.path.join(folder, "tasks.journal"))
+            start = time.perf_counter()
+            store.load()
+            report(f"{count:>7} tasks, cold start", time.perf_counter() - start)
+            start = time.perf_counter()
+            store.load()
+            report(f"{count:>7} tasks, warm start", time.perf_counter() - start)
+
+
+def bench_index():
+    app = load_app("1.9")
+    print("index: one category page and due-today count, 200 matching tasks as the store grows")
+    for count in (10_000, 100_000, 500_000):
+        tasks = make_tasks(count)
+        for task in tasks:
+            if task["id"] <= 200:
+                task["category"] = "Shopping"
+                task["due_date"] = "2025-01-01"
+            elif task["category"] == "Shopping":
+                task["category"] = "Work"
+        with tempfile.TemporaryDirectory() as folder:
+            store = app.JsonTaskStore(os.path.join(folder, "tasks.json"), os.path.join(folder, "tasks.journal"))
+            store.set_tasks(tasks)
+            runs = 100
+            start = time.perf_counter()
+            for _ in range(runs):
+                [task for task in store.all_tasks() if task.get("category") == "Shopping"]
+            report(f"{count:>7} tasks, category page by full scan", time.perf_counter() - start, runs)
+            start = time.perf_counter()
+            for _ in range(runs):
+                store.category_tasks("Shopping")
+            report(f"{count:>7} tasks, category page from TaskIndex", time.perf_counter() - start, runs)
+            start = time.perf_counter()
+            for _ in range(runs):
+                store.count_due("2025-01-01")
+            report(f"{count:>7} tasks, due-today count from TaskIndex", time.perf_counter() - start, runs)
+
+
+def traced_bytes(build):
+    # Bytes still allocated by whatever build() returns
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        result = build()
+        return tracemalloc.get_traced_memory()[0] - before, result
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory():
+    app = load_app("1.9")
+    print("memory: bytes per task held in memory, tracemalloc")
+    count = 100_000
+    tasks = make_tasks(count)
+    for task in tasks:
+        if task["status"] == "Completed":
+            task["completed_date"] = "2024-02-01 17:30"
+    with tempfile.TemporaryDirectory() as folder:
+        json_path = os.path.join(folder, "tasks.json")
+        with open(json_path, "w") as file:
+            json.dump(tasks, file, indent=4)
+        del tasks
+
+        def dicts():
+            with open(json_path) as file:
+                return json.load(file)
+
+        def slotted():
+            with open(json_path) as file:
+                return [app.Task(task) for task in app.iter_json_array(file)]
+
+        def store():
+            json_store = app.JsonTaskStore(json_path, os.path.join(folder, "tasks.journal"))
+            json_store.load()
+            return json_store
+
+        for label, build in (("dict per task (json.load)", dicts),
+                             ("Task with __slots__", slotted),
+                             ("JsonTaskStore incl. TaskIndex", store)):
+            size, result = traced_bytes(build)
+            print(f"  {count:>7} tasks, {label:<36} {size / count:>8.0f} bytes/task")
+            del result
+
+
+def bench_search():
+    app = load_app("1.9")
+    print("search: header search-as-you-type, latency per keystroke at 100k tasks")
+    count = 100_000
+    query = "task 4321"
+    with tempfile.TemporaryDirectory() as folder:
+        json_store = app.JsonTaskStore(os.path.join(folder, "tasks.json"), os.path.join(folder, "tasks.journal"))
+        json_store.set_tasks(make_tasks(count))
+        json_store.compact()
+        sqlite_store = app.SQLiteTaskStore(
+            os.path.join(folder, "tasks.db"),
+            os.path.join(folder, "tasks.json"),
+            os.path.join(folder, "tasks.journal"),
+        )
+        sqlite_store.load()
+        start = time.perf_counter()
+        json_store.prepare_search()
+        report(f"{count:>7} tasks, json index build on search focus", time.perf_counter() - start)
+
+        # TaskStore.search is the scan every store falls back to
+        scan = lambda typed: app.TaskStore.search(json_store, typed, app.SEARCH_LIMIT)
+        for name, search in (("scan", scan),
+                             ("json TaskSearchIndex", lambda typed: json_store.search(typed, app.SEARCH_LIMIT)),
+                             ("sqlite FTS5", lambda typed: sqlite_store.search(typed, app.SEARCH_LIMIT))):
+            times = []
+            for length in range(1, len(query) + 1):
+                start = time.perf_counter()
+                search(query[:length])
+                times.append(time.perf_counter() - start)
+            report(f"{count:>7} tasks, {name} mean keystroke", sum(times), len(times))
+            report(f"{count:>7} tasks, {name} worst keystroke", max(times))
+        sqlite_store.close()
+
+
+def bench_treeview():
+    app = load_app("1.9")
+    print("treeview: category list first paint and scroll frame, Treeview vs VirtualTreeview")
+    try:
+        root = app.tk.Tk()
+    except app.tk.TclError:
+        print("  needs a display, skipped")
+        return
+    root.geometry("900x600")
+    columns = ("Complete", "Task", "Due Date", "Priority", "Status")
+    for count in (10_000, 100_000, 1_000_000):
+        rows = [("☐", task["task"], task["due_date"], task["priority"], task["status"])
+                for task in make_tasks(count)]
+        for name, tree_class in (("Treeview", app.ttk.Treeview), ("VirtualTreeview", app.VirtualTreeview)):
+            if tree_class is app.ttk.Treeview and count > 100_000:
+                # Takes minutes and gigabytes, nothing left to learn
+                continue
+            tree = tree_class(root, columns=columns, show="headings")
+            tree.pack(fill="both", expand=True)
+            start = time.perf_counter()
+            for iid, values in enumerate(rows):
+                tree.insert("", "end", iid=str(iid), values=values)
+            root.update()
+            report(f"{count:>7} rows, {name} first paint", time.perf_counter() - start)
+
+            frames = 50
+            start = time.perf_counter()
+            for _ in range(frames):
+                tree.yview("scroll", 3, "units")
+                root.update_idletasks()
+            report(f"{count:>7} rows, {name} scroll frame", time.perf_counter() - start, frames)
+            tree.destroy()
+    root.destroy()
+
+
+BENCHMARKS = {
+    "journal": bench_journal,
+    "sqlite": bench_sqlite,
+    "binary": bench_binary,
+    "cache": bench_cache,
+    "index": bench_index,
+    "memory": bench_memory,
+    "search": bench_search,
+    "treeview": bench_treeview,
+}
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["--open-first-page"]:
+        open_first_page(*sys.argv[2:])
+        sys.exit()
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -13,8 +13,10 @@ class ModernToDoList:
         self.root.geometry("1200x800")
         self.root.configure(bg="#F5F5F5")
         
-        # Load data
+        # Load data, with an index from task id to task
         self.tasks = self.load_tasks()
+        self.task_index = {task["id"]: task for task in self.tasks}
+        self.next_id = max(self.task_index, default=0) + 1
         self.categories = ["My Day", "Important", "Planned", "Personal", "Work", "Shopping"]
         self.current_category = "My Day"
         
@@ -320,7 +322,7 @@ class ModernToDoList:
             if task["status"] == "Completed":
                 tags = tags + ("completed",)
                 
-            self.task_tree.insert("", "end", values=values, tags=tags)
+            self.task_tree.insert("", "end", iid=str(task["id"]), values=values, tags=tags)
         
         # Update category counter
         self.update_category_counter(len(category_tasks))
@@ -345,8 +347,10 @@ class ModernToDoList:
                 "priority": priority,
                 "category": self.current_category,
                 "status": "Pending",
-                "created_date": datetime.now().strftime("%Y-%m-%d %H:%M")
+                "created_date": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                "id": self.next_id
             }
+            self.next_id += 1
             
             # Add to Important if marked as high priority
             if priority == "High" and self.current_category != "Important":
@@ -356,6 +360,7 @@ class ModernToDoList:
                 )
             
             self.tasks.append(new_task)
+            self.task_index[new_task["id"]] = new_task
             self.save_tasks()
             self.refresh_task_list()
             self.task_var.set("")
@@ -374,18 +379,15 @@ class ModernToDoList:
     def complete_task(self):
         selected = self.task_tree.selection()
         if selected:
-            item = selected[0]
-            task_idx = self.task_tree.index(item)
-            self.tasks[task_idx]["status"] = "Completed"
+            # Row iids are task ids
+            self.task_index[int(selected[0])]["status"] = "Completed"
             self.save_tasks()
             self.refresh_task_list()
             
     def edit_task(self):
         selected = self.task_tree.selection()
         if selected:
-            item = selected[0]
-            task_idx = self.task_tree.index(item)
-            task = self.tasks[task_idx]
+            task = self.task_index[int(selected[0])]
             
             # Create edit dialog
             edit_window = tk.Toplevel(self.root)
@@ -419,18 +421,24 @@ class ModernToDoList:
         selected = self.task_tree.selection()
         if selected:
             if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete this task?"):
-                item = selected[0]
-                task_idx = self.task_tree.index(item)
-                self.tasks.pop(task_idx)
+                task = self.task_index.pop(int(selected[0]))
+                self.tasks.remove(task)
                 self.save_tasks()
                 self.refresh_task_list()
                 
     def load_tasks(self):
         try:
             with open("tasks.json", "r") as file:
-                return json.load(file)
+                tasks = json.load(file)
         except FileNotFoundError:
             return []
+        # Older files have no task ids, number them in file order
+        next_id = max((task["id"] for task in tasks if "id" in task), default=0) + 1
+        for task in tasks:
+            if "id" not in task:
+                task["id"] = next_id
+                next_id += 1
+        return tasks
             
     def save_tasks(self):
         with open("tasks.json", "w") as file:
@@ -1,16 +1,2247 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
 from tkcalendar import DateEntry
+import gzip
+import hashlib
+import heapq
 import json
-from datetime import datetime
+import mmap
+import os
+import pickle
+import re
+import sqlite3
+import struct
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+from bisect import bisect_left, bisect_right, insort
+from collections import deque
+from collections.abc import MutableMapping
+from datetime import datetime, timedelta
+from functools import lru_cache
+from itertools import islice
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
+TASKS_FILE = "tasks.json"
+JOURNAL_FILE = "tasks.journal"
+DATABASE_FILE = "tasks.db"
+BINARY_FILE = "tasks.bin"
+BINARY_JOURNAL_FILE = "tasks.bin.journal"
+SHARDS_FOLDER = "task_shards"
+ARCHIVE_FILE = "tasks.archive.gz"
+ARCHIVE_SUMMARY_FILE = "tasks.archive.json"
+
+# Completed tasks older than this move out of the working set
+ARCHIVE_AFTER_DAYS = 30
+# Archived tasks shown per click of "Show Archived"
+ARCHIVE_PAGE_SIZE = 50
+
+# Tasks parsed per step when streaming a large tasks.json
+LOAD_BATCH_SIZE = 1000
+
+# Layout of tasks.json.cache, bumped when it changes so older caches are
+# ignored and written again
+CACHE_FORMAT = 1
+
+# "json" keeps tasks in tasks.json plus its journal, "sqlite" in tasks.db,
+# "binary" in the memory-mapped tasks.bin plus its journal and "sharded" in
+# one journaled JSON file per category under task_shards
+STORE_BACKEND = "json"
+
+# How often an open window looks for changes made by another instance
+STORE_POLL_MS = 1000
+
+# Most rows the header search shows at once
+SEARCH_LIMIT = 200
+
+# Rows a task list keeps in the widget below the ones that fit on screen
+VIRTUAL_OVERSCAN = 10
+
+# Pages kept built after they were last shown, the least recently shown
+# one is destroyed past this; None keeps every page once built
+PAGE_CACHE_SIZE = None
+
+class FileLock:
+    """Advisory lock on a side file, shared by every process using a store.
+
+    Re-entrant within one process, so a store method holding it can call
+    another one that takes it too.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.file = None
+        self.depth = 0
+
+    def __enter__(self):
+        if self.depth == 0:
+            self.file = open(self.path, "a+b")
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_EX)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_LOCK, 1)
+        self.depth += 1
+        return self
+
+    def __exit__(self, *exc_info):
+        self.depth -= 1
+        if self.depth == 0:
+            if fcntl is not None:
+                fcntl.flock(self.file.fileno(), fcntl.LOCK_UN)
+            else:
+                self.file.seek(0)
+                msvcrt.locking(self.file.fileno(), msvcrt.LK_UNLCK, 1)
+            self.file.close()
+            self.file = None
+
+def read_journal(path, offset=0):
+    # Yields the change records appended by append_journal from offset on,
+    # each with the offset just past it
+    try:
+        with open(path, "rb") as file:
+            file.seek(offset)
+            for line in file:
+                # A line without its newline is still being written, or was
+                # torn by a crash mid-write, stop before it
+                if not line.endswith(b"\n"):
+                    return
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    return
+                offset += len(line)
+                yield record, offset
+    except FileNotFoundError:
+        return
+
+def iter_json_array(file, chunk_size=65536):
+    # Yields the items of a top-level JSON array one at a time, holding only
+    # about one chunk of the file in memory instead of the whole text
+    decoder = json.JSONDecoder()
+    buffer = ""
+    position = 0
+    started = False
+    at_end = False
+    while True:
+        while position < len(buffer) and (buffer[position].isspace() or (started and buffer[position] == ",")):
+            position += 1
+        if position < len(buffer) and not started:
+            if buffer[position] != "[":
+                raise ValueError("Expected a JSON array of tasks")
+            started = True
+            position += 1
+            continue
+        if position < len(buffer) and buffer[position] == "]":
+            return
+        if position < len(buffer):
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+                yield item
+                continue
+            except json.JSONDecodeError:
+                # The item runs past the end of the buffer, read more below
+                if at_end:
+                    raise
+        if at_end:
+            if started:
+                raise ValueError("Unexpected end of task file")
+            return
+        chunk = file.read(chunk_size)
+        at_end = not chunk
+        buffer = buffer[position:] + chunk
+        position = 0
+
+def journal_record(op, task):
+    if op == "delete":
+        return {"op": op, "id": task["id"]}
+    return {"op": op, "task": task}
+
+def append_journal(path, op, task):
+    # Returns the journal size after the write
+    with open(path, "ab") as file:
+        file.write((json.dumps(journal_record(op, task), default=Task.to_dict) + "\n").encode("utf-8"))
+        return file.tell()
+
+def finished_before(task, cutoff):
+    # Completed, or if that is unknown created, before the cutoff day
+    return (task.get("completed_date") or task.get("created_date") or "") < cutoff
+
+class TaskStore:
+    """Persistence backend behind ModernToDoList.
+
+    Pages never read the task file themselves. They ask the store for the
+    rows they show and report every change to it, so each backend can answer
+    queries in whatever way suits it.
+    """
+
+    # True while a backend is still reading tasks in the background
+    loading = False
+
+    def load(self):
+        raise NotImplementedError
+
+    def next_task_id(self):
+        raise NotImplementedError
+
+    def add(self, task):
+        raise NotImplementedError
+
+    def update(self, task):
+        raise NotImplementedError
+
+    def delete(self, task):
+        raise NotImplementedError
+
+    def delete_many(self, tasks):
+        for task in tasks:
+            self.delete(task)
+
+    def get(self, task_id):
+        # The task with this id, or None
+        raise NotImplementedError
+
+    def save(self):
+        pass
+
+    def close(self):
+        pass
+
+    def poll_changes(self):
+        # Journal records written by other instances since the last poll,
+        # or None when they changed too much to merge and pages should reload
+        return []
+
+    def all_tasks(self):
+        raise NotImplementedError
+
+    def category_tasks(self, category):
+        raise NotImplementedError
+
+    def completed_tasks(self):
+        return [task for task in self.all_tasks() if task.get("status") == "Completed"]
+
+    def completed_before(self, cutoff):
+        # Completed tasks finished, or if that is unknown created, before
+        # the cutoff day
+        return [task for task in self.completed_tasks() if finished_before(task, cutoff)]
+
+    def category_status_counts(self):
+        # Maps (category, status) to the number of tasks
+        raise NotImplementedError
+
+    def count_due(self, due_date):
+        raise NotImplementedError
+
+    def count_due_between(self, start, end):
+        # Tasks due on days start..end, both included and either one None
+        # for an open range
+        return sum(
+            1 for task in self.all_tasks()
+            if task.get("due_date") and (start is None or task["due_date"] >= start)
+            and (end is None or task["due_date"] <= end)
+        )
+
+    def count_overdue(self, today):
+        # Tasks not completed whose due day is before today
+        return sum(
+            1 for task in self.all_tasks()
+            if task.get("due_date") and task["due_date"] < today and task.get("status") != "Completed"
+        )
+
+    def prepare_search(self):
+        # Called when the search box gets focus, before the first keystroke
+        pass
+
+    def search(self, query, limit=None):
+        # Tasks with a word starting with each word of the query, by id
+        prefixes = search_words(query)
+        if not prefixes:
+            return []
+        matches = (
+            task for task in self.all_tasks()
+            if all(any(word.startswith(prefix) for word in task_search_words(task)) for prefix in prefixes)
+        )
+        return list(islice(matches, limit))
+
+class CodeTable:
+    """Small integer codes for a field with only a few distinct values."""
+
+    def __init__(self, values):
+        self.values = []
+        self.codes = {}
+        for value in values:
+            self.encode(value)
+
+    def encode(self, value):
+        # New values, such as a category added later, get the next code
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value):
+        # Code of a value, or None if no task ever had it
+        return self.codes.get(value)
+
+    def decode(self, code):
+        return self.values[code]
+
+class DateCodec:
+    """Dates as integers: day ordinals, or seconds since 1970-01-01 00:00.
+
+    Seconds are counted on the wall clock, with no time zone applied, so
+    every value formats back to exactly the text it was parsed from. Text in
+    any other shape is rejected, and Task keeps such a value as it is.
+    """
+
+    def __init__(self, text_format, with_time):
+        self.text_format = text_format  # Only used to format, parsing is ISO
+        self.with_time = with_time
+        # Few distinct dates repeat across many tasks
+        self.encode = lru_cache(maxsize=4096)(self.encode)
+        self.decode = lru_cache(maxsize=4096)(self.decode)
+
+    def encode(self, text):
+        moment = datetime.fromisoformat(text)
+        if not self.with_time:
+            value = moment.toordinal()
+        else:
+            value = (moment.toordinal() - EPOCH_ORDINAL) * 86400 + moment.hour * 3600 + moment.minute * 60
+        if self.decode(value) != text:
+            raise ValueError(f"{text!r} does not match {self.text_format!r}")
+        return value
+
+    def find(self, text):
+        try:
+            return self.encode(text)
+        except (TypeError, ValueError):
+            return None
+
+    def decode(self, value):
+        if not self.with_time:
+            return datetime.fromordinal(value).strftime(self.text_format)
+        days, seconds = divmod(value, 86400)
+        moment = datetime.fromordinal(days + EPOCH_ORDINAL) + timedelta(seconds=seconds)
+        return moment.strftime(self.text_format)
+
+EPOCH_ORDINAL = datetime(1970, 1, 1).toordinal()
+DAY_CODEC = DateCodec("%Y-%m-%d", with_time=False)
+TIME_CODEC = DateCodec("%Y-%m-%d %H:%M", with_time=True)
+
+CATEGORY_CODES = CodeTable(["My Day", "Important", "Planned", "Personal", "Work", "Shopping"])
+PRIORITY_CODES = CodeTable(["Low", "Normal", "High"])
+STATUS_CODES = CodeTable(["Pending", "Completed"])
+COMPLETED = STATUS_CODES.encode("Completed")
+
+class Task(MutableMapping):
+    """One task, reading and writing like the dict it replaces.
+
+    The usual fields live in slots rather than a per-task dict, holding
+    ints: CodeTable codes for category, priority and status, a day ordinal
+    for the due date and DateCodec seconds for the timestamps. The store
+    compares, filters and counts those ints; reading a field through the
+    mapping formats it back to the string. Any other keys, and dates in an
+    unexpected format, go to a small extra dict. json.dump needs to_dict as
+    its default to write one out.
+    """
+
+    FIELDS = ("task", "due_date", "priority", "category", "status", "created_date", "id", "completed_date")
+    __slots__ = FIELDS + ("extra",)
+
+    def __init__(self, fields=None):
+        self.extra = None
+        if fields:
+            # __setitem__ inlined, this runs for every field of every task loaded
+            for key, value in fields.items():
+                codec = TASK_CODECS.get(key)
+                if codec is not None:
+                    try:
+                        setattr(self, key, codec.encode(value))
+                        continue
+                    except (TypeError, ValueError):
+                        pass
+                elif key in TASK_SLOTS:
+                    setattr(self, key, value)
+                    continue
+                if self.extra is None:
+                    self.extra = {}
+                self.extra[key] = value
+
+    def __getitem__(self, key):
+        if key in TASK_SLOTS:
+            value = getattr(self, key, MISSING)
+            if value is not MISSING:
+                return TASK_CODECS[key].decode(value) if key in TASK_CODECS else value
+        if self.extra is not None and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        if key in TASK_CODECS:
+            try:
+                setattr(self, key, TASK_CODECS[key].encode(value))
+                if self.extra is not None:
+                    self.extra.pop(key, None)
+                return
+            except (TypeError, ValueError):
+                # Kept as given, in extra
+                if hasattr(self, key):
+                    delattr(self, key)
+        elif key in TASK_SLOTS:
+            setattr(self, key, value)
+            return
+        if self.extra is None:
+            self.extra = {}
+        self.extra[key] = value
+
+    def __delitem__(self, key):
+        if key in TASK_SLOTS and hasattr(self, key):
+            delattr(self, key)
+        elif self.extra is not None and key in self.extra:
+            del self.extra[key]
+        else:
+            raise KeyError(key)
+
+    # get and in are on every hot path, skip the generic Mapping versions
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key):
+        if key in TASK_SLOTS and hasattr(self, key):
+            return True
+        return self.extra is not None and key in self.extra
+
+    def __iter__(self):
+        for key in Task.FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self.extra:
+            yield from self.extra
+
+    def __len__(self):
+        return sum(1 for key in self)
+
+    def __repr__(self):
+        return f"Task({self.to_dict()!r})"
+
+    def same_fields(self, other):
+        # Both hold codes from the same tables, so the raw slots compare
+        return all(getattr(self, key, MISSING) == getattr(other, key, MISSING) for key in Task.__slots__)
+
+    def to_dict(self):
+        fields = {}
+        for key in Task.FIELDS:
+            value = getattr(self, key, MISSING)
+            if value is not MISSING:
+                fields[key] = TASK_CODECS[key].decode(value) if key in TASK_CODECS else value
+        if self.extra:
+            fields.update(self.extra)
+        return fields
+
+    @staticmethod
+    def to_columns(tasks):
+        # The encoded slots of tasks column by column, for the load cache,
+        # one at a time so only one column is held. A column lists the rows
+        # that have the field unless all of them do
+        for key in Task.__slots__:
+            values = [getattr(task, key, MISSING) for task in tasks]
+            if MISSING in values:
+                rows = [row for row, value in enumerate(values) if value is not MISSING]
+                yield key, rows, [values[row] for row in rows]
+            else:
+                yield key, None, values
+
+    @staticmethod
+    def code_tables():
+        return {key: list(TASK_CODECS[key].values) for key in CODE_FIELDS}
+
+    @staticmethod
+    def from_columns(count, columns, code_tables):
+        # Rebuilds tasks from to_columns by mapping each slot's setter over
+        # its column, nothing is parsed or encoded again
+        tasks = [Task.__new__(Task) for _ in range(count)]
+        for key, rows, values in columns:
+            if key in CODE_FIELDS:
+                # Codes are handed out as values are first seen, so another
+                # run may have numbered them differently
+                table = TASK_CODECS[key]
+                codes = [table.encode(value) for value in code_tables[key]]
+                if codes != list(range(len(codes))):
+                    values = [codes[code] for code in values]
+            elif key in TASK_CODECS:
+                # Few distinct dates, share one int per date like the codecs do
+                shared = {}
+                values = [shared.setdefault(value, value) for value in values]
+            owners = tasks if rows is None else [tasks[row] for row in rows]
+            deque(map(getattr(Task, key).__set__, owners, values), maxlen=0)
+        return tasks
+
+MISSING = object()
+TASK_SLOTS = frozenset(Task.FIELDS)
+TASK_CODECS = {
+    "category": CATEGORY_CODES,
+    "priority": PRIORITY_CODES,
+    "status": STATUS_CODES,
+    "due_date": DAY_CODEC,
+    "created_date": TIME_CODEC,
+    "completed_date": TIME_CODEC
+}
+CODE_FIELDS = ("category", "priority", "status")
+
+def as_task(task):
+    return task if isinstance(task, Task) else Task(task)
+
+class TaskIndex:
+    """Ids of the tasks with each category, status and due date.
+
+    Kept up to date on every add, update and delete, so a page or a count
+    only touches the tasks it is about instead of scanning all of them.
+    Category and status are indexed by their codes. The distinct due days
+    are also kept sorted, so date ranges are found by bisection, and the
+    number of tasks per category and status pair is counted as tasks come
+    and go, so the dashboard totals cost nothing per task.
+    """
+
+    FIELDS = ("category", "status", "due_date")
+
+    def __init__(self):
+        self.ids = {field: {} for field in self.FIELDS}  # field -> value -> ids
+        self.keys = {}  # task id -> indexed field values, to unindex after edits
+        self.due_days = []  # sorted day ordinals that have at least one task
+        self.pair_counts = {}  # (category, status) codes -> number of tasks
+
+    def add(self, task):
+        # Also re-indexes a task whose fields were edited in place
+        task_id = task.id
+        key = (getattr(task, "category", None), getattr(task, "status", None), getattr(task, "due_date", None))
+        old_key = self.keys.get(task_id)
+        if old_key == key:
+            return
+        if old_key is not None:
+            self.remove(task_id)
+        self.keys[task_id] = key
+        pair = key[:2]
+        self.pair_counts[pair] = self.pair_counts.get(pair, 0) + 1
+        for field, value in zip(self.FIELDS, key):
+            ids = self.ids[field].get(value)
+            if ids is None:
+                self.ids[field][value] = {task_id}
+                if field == "due_date" and value is not None:
+                    insort(self.due_days, value)
+            else:
+                ids.add(task_id)
+
+    def remove(self, task_id):
+        key = self.keys.pop(task_id, None)
+        if key is None:
+            return
+        pair = key[:2]
+        self.pair_counts[pair] -= 1
+        if not self.pair_counts[pair]:
+            del self.pair_counts[pair]
+        for field, value in zip(self.FIELDS, key):
+            ids = self.ids[field][value]
+            ids.discard(task_id)
+            if not ids:
+                del self.ids[field][value]
+                if field == "due_date" and value is not None:
+                    del self.due_days[bisect_left(self.due_days, value)]
+
+    def lookup(self, field, value):
+        if field in TASK_CODECS:
+            value = TASK_CODECS[field].find(value)
+        return self.ids[field].get(value, set())
+
+    def due_between(self, first, last):
+        # Id sets of the due days first..last (ordinals, None for open), by day
+        days = self.due_days
+        low = 0 if first is None else bisect_left(days, first)
+        high = len(days) if last is None else bisect_right(days, last)
+        by_day = self.ids["due_date"]
+        return [by_day[day] for day in days[low:high]]
+
+SEARCH_WORD = re.compile(r"\w+")
+SEARCH_FIELDS = ("task", "notes")
+
+def search_words(text):
+    return set(SEARCH_WORD.findall(text.lower()))
+
+def task_search_words(task):
+    words = set()
+    for field in SEARCH_FIELDS:
+        words |= search_words(task.get(field) or "")
+    return words
+
+class TaskSearchIndex:
+    """Ids of the tasks containing each word of their text and notes.
+
+    The distinct words are kept sorted, so all words starting with what
+    has been typed so far form one slice found by bisection.
+    """
+
+    def __init__(self, tasks=()):
+        self.ids = {}  # word -> ids of the tasks containing it
+        self.task_words = {}  # task id -> its words, to unindex after edits
+        for task in tasks:
+            task_id = task.id
+            words = self.task_words[task_id] = self.words_of(task)
+            for word in words:
+                ids = self.ids.get(word)
+                if ids is None:
+                    self.ids[word] = {task_id}
+                else:
+                    ids.add(task_id)
+        # Sorted once here, add and remove keep it sorted
+        self.words = sorted(self.ids)
+
+    @staticmethod
+    def words_of(task):
+        # task_search_words for a Task, reading the slot and extra directly
+        # since the first search runs this for every task
+        text = getattr(task, "task", None) or ""
+        if task.extra and task.extra.get("notes"):
+            text = f"{text} {task.extra['notes']}"
+        return search_words(text)
+
+    def add(self, task):
+        # Also re-indexes a task whose text was edited
+        task_id = task.id
+        words = self.words_of(task)
+        old_words = self.task_words.get(task_id, set())
+        self.task_words[task_id] = words
+        self.unlink(task_id, old_words - words)
+        for word in words - old_words:
+            ids = self.ids.get(word)
+            if ids is None:
+                self.ids[word] = {task_id}
+                insort(self.words, word)
+            else:
+                ids.add(task_id)
+
+    def remove(self, task_id):
+        self.unlink(task_id, self.task_words.pop(task_id, ()))
+
+    def unlink(self, task_id, words):
+        for word in words:
+            ids = self.ids[word]
+            ids.discard(task_id)
+            if not ids:
+                del self.ids[word]
+                del self.words[bisect_left(self.words, word)]
+
+    def search(self, query):
+        matches = None
+        # Longest prefixes first, they usually match the fewest tasks
+        for prefix in sorted(search_words(query), key=len, reverse=True):
+            low = bisect_left(self.words, prefix)
+            high = bisect_left(self.words, prefix + "\U0010ffff", low)
+            ids = set().union(*(self.ids[word] for word in self.words[low:high]))
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                break
+        return matches or set()
+
+class CacheUnpickler(pickle.Unpickler):
+    """Reads tasks.json.cache, which only ever holds plain data.
+
+    Anyone who can write to the working directory can replace the cache,
+    so every class or function a pickle names is refused instead of
+    imported and called.
+    """
+
+    def find_class(self, module, name):
+        raise pickle.UnpicklingError(f"{module}.{name} is not allowed in the task cache")
+
+class JsonTaskStore(TaskStore):
+    """Tasks in tasks.json with an append-only journal of changes on top.
+
+    Each add/update/delete writes one short JSON line to the journal instead
+    of rewriting every task. When enough records pile up the full task list
+    is written out as a new snapshot and the journal is emptied. Loading
+    reads the snapshot and replays whatever is left in the journal.
+
+    The loaded tasks are also pickled next to it as Task.to_columns, along
+    with their TaskIndex, keyed by the snapshot's size, mtime and hash, so
+    a warm start skips the parse and the indexing and only unpickles.
+
+    Several instances can share the files. Every write happens under a lock
+    file after reading what the others appended, and the journal's
+    generation (bumped by each compaction) plus its size form the store
+    version that poll_changes compares against.
+    """
+
+    def __init__(self, snapshot_path=TASKS_FILE, journal_path=JOURNAL_FILE, compact_every=1000):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.cache_path = snapshot_path + ".cache"
+        self.lock = FileLock(snapshot_path + ".lock")
+        self.compact_every = compact_every
+        self.pending = 0
+        self.next_id = 1
+        self.max_read_id = 0  # Highest id read back from disk
+        self.tasks = {}  # task id -> task, in file order
+        self.index = TaskIndex()
+        self.search_index = None  # Built by the first search
+        self.loading = False
+        self.generation = 0
+        self.journal_offset = 0
+        self.remote_changes = []  # Records from other instances not yet polled
+
+    def load(self):
+        for batch in self.load_batches():
+            pass
+        return self.all_tasks()
+
+    def load_batches(self, batch_size=LOAD_BATCH_SIZE):
+        # Streams tasks.json and yields the tasks in batches as they are
+        # parsed, so a page can show its first rows before the rest is read
+        self.loading = True
+        self.tasks = {}
+        self.index = TaskIndex()
+        self.search_index = None
+        self.pending = 0
+        self.generation = 0
+        self.journal_offset = 0
+        changes = {}  # task id -> task from the journal, None when deleted
+        with self.lock:
+            for record, self.journal_offset in read_journal(self.journal_path):
+                if record["op"] == "generation":
+                    self.generation = record["generation"]
+                    continue
+                if record["op"] == "delete":
+                    changes[record["id"]] = None
+                else:
+                    changes[record["task"]["id"]] = record["task"]
+                self.pending += 1
+
+        # Older snapshots have no task ids, hand them out once and persist
+        needs_ids = False
+        max_id = max(changes, default=0)
+        cached = self.read_cache()
+        if cached is not None:
+            tasks, index = cached
+            max_id = max(max_id, max((task.id for task in tasks), default=0))
+            if index is None:
+                # The codes were numbered differently, index the tasks again
+                self.add_loaded(tasks)
+            else:
+                self.tasks = {task.id: task for task in tasks}
+                self.index = index
+            # The cache may already hold some of these, replaying them again
+            # changes nothing
+            for task_id, task in changes.items():
+                if task is None:
+                    self.tasks.pop(task_id, None)
+                    self.index.remove(task_id)
+                else:
+                    self.add_loaded([task])
+            # Everything is in already, so it all goes out as one batch
+            yield list(self.tasks.values())
+        else:
+            seen = set()
+            batch = []
+            for task in self.read_snapshot():
+                if "id" not in task:
+                    needs_ids = True
+                    max_id += 1
+                    task["id"] = max_id
+                max_id = max(max_id, task["id"])
+                if task["id"] in changes:
+                    seen.add(task["id"])
+                    task = changes[task["id"]]
+                    if task is None:
+                        continue
+                batch.append(task)
+                if len(batch) >= batch_size:
+                    yield self.add_loaded(batch)
+                    batch = []
+
+            # Tasks added since the snapshot was written
+            batch.extend(task for task_id, task in changes.items() if task is not None and task_id not in seen)
+            yield self.add_loaded(batch)
+
+        self.next_id = max_id + 1
+        self.max_read_id = max_id
+        self.loading = False
+        if needs_ids or self.pending >= self.compact_every:
+            self.compact()
+        elif cached is None:
+            self.write_cache()
+
+    def read_snapshot(self):
+        try:
+            with open(self.snapshot_path, "r") as file:
+                yield from iter_json_array(file)
+        except FileNotFoundError:
+            return
+
+    def snapshot_digest(self):
+        digest = hashlib.blake2b(digest_size=16)
+        with open(self.snapshot_path, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def read_cache(self):
+        # A missing, broken, stale or older-format cache just means a full
+        # parse; anything else is a bug and is raised
+        try:
+            with open(self.cache_path, "rb") as file:
+                # The header, then each column, then the index
+                unpickler = CacheUnpickler(file)
+                cache = unpickler.load()
+                if cache.get("format") != CACHE_FORMAT:
+                    return None
+                stat = os.stat(self.snapshot_path)
+                # Size and mtime are cheap, only hash when both still match
+                if (cache["size"], cache["mtime"]) != (stat.st_size, stat.st_mtime_ns):
+                    return None
+                if cache["digest"] != self.snapshot_digest():
+                    return None
+                tasks = Task.from_columns(cache["count"], self.read_columns(unpickler), cache["codes"])
+                # The index holds codes too, it can only be reused if they
+                # kept their numbers
+                index = None
+                if all(TASK_CODECS[key].values[:len(values)] == values
+                       for key, values in cache["codes"].items()):
+                    index = TaskIndex.__new__(TaskIndex)
+                    vars(index).update(unpickler.load())
+                return tasks, index
+        except (OSError, pickle.UnpicklingError, EOFError, KeyError, AttributeError):
+            return None
+
+    def read_columns(self, unpickler):
+        # The columns write_cache pickled in slices
+        for _ in Task.__slots__:
+            key, rows, length = unpickler.load()
+            values = []
+            while len(values) < length:
+                values.extend(unpickler.load())
+            yield key, rows, values
+
+    def write_cache(self):
+        # The tasks in memory, with the journal applied, and their index
+        try:
+            stat = os.stat(self.snapshot_path)
+            cache = {
+                "format": CACHE_FORMAT,
+                "size": stat.st_size,
+                "mtime": stat.st_mtime_ns,
+                "digest": self.snapshot_digest(),
+                "count": len(self.tasks),
+                "codes": Task.code_tables()
+            }
+            temp_path = self.cache_path + ".tmp"
+            with open(temp_path, "wb") as file:
+                # Pickled piece by piece, so writing holds one column at a time
+                # A fixed protocol, so a cache written by a newer Python
+                # still reads
+                pickler = pickle.Pickler(file, protocol=5)
+                pickler.dump(cache)
+                for key, rows, values in Task.to_columns(list(self.tasks.values())):
+                    pickler.dump((key, rows, len(values)))
+                    # In slices with the memo cleared in between, so the
+                    # pickler never remembers more than a batch of values
+                    for start in range(0, len(values), LOAD_BATCH_SIZE):
+                        pickler.dump(values[start:start + LOAD_BATCH_SIZE])
+                        pickler.clear_memo()
+                pickler.dump(vars(self.index))
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            pass
+
+    def add_loaded(self, batch):
+        batch = [as_task(task) for task in batch]
+        # Ensure all tasks have required fields
+        for task in batch:
+            if "category" not in task:
+                task["category"] = "My Day"
+            if "status" not in task:
+                task["status"] = "Pending"
+            self.tasks[task["id"]] = task
+            self.index.add(task)
+        if self.search_index is not None:
+            for task in batch:
+                self.search_index.add(task)
+        return batch
+
+    def set_tasks(self, tasks):
+        # Replaces the tasks in memory, compact() writes them out
+        self.tasks = {}
+        self.index = TaskIndex()
+        self.search_index = None
+        self.add_loaded(list(tasks))
+
+    def next_task_id(self):
+        task_id = self.next_id
+        self.next_id += 1
+        return task_id
+
+    def add(self, task):
+        with self.lock:
+            self.sync()
+            # Another instance may have handed out the same id since
+            # next_task_id was called
+            if task["id"] <= self.max_read_id:
+                task["id"] = self.next_task_id()
+            task = as_task(task)
+            self.tasks[task["id"]] = task
+            self.index_task(task)
+            self.append("add", task)
+
+    def update(self, task):
+        with self.lock:
+            # Also puts back the edited task if sync had to reload
+            self.sync()
+            task = as_task(task)
+            self.tasks[task["id"]] = task
+            self.index_task(task)
+            self.append("update", task)
+
+    def delete(self, task):
+        with self.lock:
+            self.sync()
+            self.tasks.pop(task["id"], None)
+            self.unindex_task(task["id"])
+            self.append("delete", task)
+
+    def delete_many(self, tasks):
+        # One sync and lock for the whole batch
+        with self.lock:
+            self.sync()
+            for task in tasks:
+                self.tasks.pop(task["id"], None)
+                self.unindex_task(task["id"])
+                self.append("delete", task)
+
+    def get(self, task_id):
+        return self.tasks.get(task_id)
+
+    def index_task(self, task):
+        self.index.add(task)
+        if self.search_index is not None:
+            self.search_index.add(task)
+
+    def unindex_task(self, task_id):
+        self.index.remove(task_id)
+        if self.search_index is not None:
+            self.search_index.remove(task_id)
+
+    def save(self):
+        self.compact()
+
+    def append(self, op, task):
+        # Callers hold the lock and have already synced
+        self.journal_offset = append_journal(self.journal_path, op, task)
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.compact()
+
+    def journal_size(self):
+        try:
+            return os.path.getsize(self.journal_path)
+        except FileNotFoundError:
+            return 0
+
+    def journal_header(self):
+        # The compaction header and the offset after it, None for a journal
+        # that was never compacted
+        header, header_end = next(read_journal(self.journal_path), (None, 0))
+        if header is not None and header["op"] == "generation":
+            return header, header_end
+        return None, 0
+
+    def journal_generation(self):
+        header = self.journal_header()[0]
+        return header["generation"] if header is not None else 0
+
+    def sync(self):
+        # Applies what other instances appended since we last looked.
+        # Returns True when the journal was compacted by someone else in a
+        # way we could not follow and the new snapshot was read instead.
+        with self.lock:
+            # Every compaction bumps the generation in the header, so it
+            # tells a replaced journal apart even when the file system hands
+            # the new one the old inode and size
+            header, header_end = self.journal_header()
+            generation = header["generation"] if header is not None else 0
+            if generation != self.generation or self.journal_size() < self.journal_offset:
+                # Fine if it was compacted right after the last record we
+                # saw, the snapshot then holds nothing we have not read
+                if header is not None and header["previous"] == [self.generation, self.journal_offset]:
+                    self.generation = generation
+                    self.journal_offset = header_end
+                    self.pending = 0
+                elif self.loading:
+                    # The next sync after loading reloads
+                    return False
+                else:
+                    # What changed since is only in the new snapshot, so
+                    # read it and report the difference as records
+                    old_tasks = self.tasks
+                    self.load()
+                    self.remote_changes = self.changes_from(old_tasks)
+                    return True
+            for record, self.journal_offset in read_journal(self.journal_path, self.journal_offset):
+                if record["op"] != "generation":
+                    self.apply_record(record)
+                    self.remote_changes.append(record)
+                    self.pending += 1
+            return False
+
+    def changes_from(self, old_tasks):
+        # Journal-style records turning old_tasks into the tasks now loaded
+        changes = [{"op": "delete", "id": task_id} for task_id in old_tasks if task_id not in self.tasks]
+        for task_id, task in self.tasks.items():
+            old = old_tasks.get(task_id)
+            if old is None or not task.same_fields(old):
+                changes.append({"op": "update", "task": task})
+        return changes
+
+    def apply_record(self, record):
+        if record["op"] == "delete":
+            self.tasks.pop(record["id"], None)
+            self.unindex_task(record["id"])
+            return
+        task = record["task"]
+        self.add_loaded([task])
+        self.max_read_id = max(self.max_read_id, task["id"])
+        self.next_id = max(self.next_id, task["id"] + 1)
+
+    def poll_changes(self):
+        # The size and the header's generation are enough to see that
+        # nobody else wrote anything
+        if (not self.remote_changes and
+                self.journal_size() == self.journal_offset and
+                self.journal_generation() == self.generation):
+            return []
+        self.sync()
+        changes, self.remote_changes = self.remote_changes, []
+        return changes
+
+    def compact(self):
+        # Never write a snapshot of a half-loaded task list
+        if self.loading:
+            return
+        with self.lock:
+            self.sync()
+            # Write the snapshot next to the old one and swap it in, so a
+            # crash never leaves a half-written tasks.json behind
+            tasks = [task.to_dict() for task in self.tasks.values()]
+            temp_path = self.snapshot_path + ".tmp"
+            with open(temp_path, "w") as file:
+                json.dump(tasks, file, indent=4)
+            os.replace(temp_path, self.snapshot_path)
+            # Start a new journal generation. Replaying records that are
+            # already in the snapshot is harmless, so swapping after the
+            # snapshot is safe. The header tells other instances where the
+            # old journal ended, so one that had read all of it carries on.
+            header = {
+                "op": "generation",
+                "generation": self.generation + 1,
+                "previous": [self.generation, self.journal_offset]
+            }
+            temp_path = self.journal_path + ".tmp"
+            with open(temp_path, "wb") as file:
+                file.write((json.dumps(header) + "\n").encode("utf-8"))
+            os.replace(temp_path, self.journal_path)
+            self.generation += 1
+            self.journal_offset = self.journal_size()
+            self.pending = 0
+            self.write_cache()
+
+    def all_tasks(self):
+        return list(self.tasks.values())
+
+    def category_tasks(self, category):
+        # Ids grow with insertion, sorting them keeps the page in order
+        return [self.tasks[task_id] for task_id in sorted(self.index.lookup("category", category))]
+
+    def completed_tasks(self):
+        return [self.tasks[task_id] for task_id in self.index.ids["status"].get(COMPLETED, ())]
+
+    def completed_before(self, cutoff):
+        # Compares the stored seconds, nothing is parsed or formatted per task
+        cutoff = (DAY_CODEC.encode(cutoff) - EPOCH_ORDINAL) * 86400
+        return [
+            task for task in self.completed_tasks()
+            if getattr(task, "completed_date", getattr(task, "created_date", 0)) < cutoff
+        ]
+
+    def category_status_counts(self):
+        # Kept by the index on every change, names are decoded once per pair
+        return {
+            (CATEGORY_CODES.decode(category), STATUS_CODES.decode(status)): count
+            for (category, status), count in self.index.pair_counts.items()
+        }
+
+    def count_due(self, due_date):
+        return len(self.index.lookup("due_date", due_date))
+
+    def due_id_sets(self, start, end):
+        return self.index.due_between(
+            None if start is None else DAY_CODEC.encode(start),
+            None if end is None else DAY_CODEC.encode(end)
+        )
+
+    def count_due_between(self, start, end):
+        return sum(len(ids) for ids in self.due_id_sets(start, end))
+
+    def prepare_search(self):
+        if self.search_index is None:
+            self.search_index = TaskSearchIndex(self.tasks.values())
+
+    def search(self, query, limit=None):
+        self.prepare_search()
+        ids = self.search_index.search(query)
+        ids = sorted(ids) if limit is None else heapq.nsmallest(limit, ids)
+        return [self.tasks[task_id] for task_id in ids]
+
+    def count_overdue(self, today):
+        completed = self.index.ids["status"].get(COMPLETED, set())
+        return sum(
+            len(ids) - len(ids & completed)
+            for ids in self.index.due_between(None, DAY_CODEC.encode(today) - 1)
+        )
+
+class SQLiteTaskStore(TaskStore):
+    """Tasks in a SQLite database, one row per task.
+
+    Category, status and due date are indexed so a page only reads its own
+    rows and the dashboard counts with GROUP BY. On first run the existing
+    tasks.json (and journal) is imported.
+
+    Triggers log the id of every changed row in task_changes, whose
+    increasing version column is the store version other instances poll.
+    They also keep the number of tasks per category and status in
+    task_counts, which the dashboard reads instead of grouping every row,
+    and the FTS5 table task_search in step for the header search, when
+    this SQLite build has FTS5.
+    """
+
+    COLUMNS = ("id", "task", "due_date", "priority", "category", "status", "created_date")
+    # Change log rows kept for instances that have fallen behind
+    KEEP_CHANGES = 10000
+
+    def __init__(self, database_path=DATABASE_FILE, import_path=TASKS_FILE, import_journal_path=JOURNAL_FILE):
+        self.database_path = database_path
+        self.import_path = import_path
+        self.import_journal_path = import_journal_path
+        self.connection = None
+        self.next_id = 1
+        self.version = 0
+        self.own_changes = []  # (after, last) change-log versions written by this instance
+        self.data_version = None
+        self.full_text = False
+
+    def load(self):
+        self.connection = sqlite3.connect(self.database_path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS tasks ("
+                "id INTEGER PRIMARY KEY, task TEXT, due_date TEXT, priority TEXT, "
+                "category TEXT, status TEXT, created_date TEXT, extra TEXT)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_category ON tasks (category, status)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks (status)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_tasks_due_date ON tasks (due_date)")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS task_changes (version INTEGER PRIMARY KEY AUTOINCREMENT, task_id INTEGER)"
+            )
+            for event, row in (("INSERT", "NEW"), ("UPDATE", "NEW"), ("DELETE", "OLD")):
+                self.connection.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS log_task_{event.lower()} AFTER {event} ON tasks "
+                    f"BEGIN INSERT INTO task_changes (task_id) VALUES ({row}.id); END"
+                )
+
+        empty = self.connection.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is None
+        if empty and os.path.exists(self.import_path):
+            json_store = JsonTaskStore(self.import_path, self.import_journal_path)
+            with self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [self.to_row(task) for task in json_store.load()]
+                )
+        # After the import, so a new database fills these in one statement
+        # each instead of through the triggers row by row
+        self.create_counts_table()
+        self.full_text = self.create_search_table()
+
+        max_id = self.connection.execute("SELECT MAX(id) FROM tasks").fetchone()[0]
+        self.next_id = (max_id or 0) + 1
+        self.version = self.connection.execute("SELECT MAX(version) FROM task_changes").fetchone()[0] or 0
+        with self.connection:
+            self.connection.execute("DELETE FROM task_changes WHERE version <= ?", (self.version - self.KEEP_CHANGES,))
+        self.data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+
+    def create_counts_table(self):
+        with self.connection:
+            exists = self.connection.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'task_counts'"
+            ).fetchone() is not None
+            self.connection.execute("CREATE TABLE IF NOT EXISTS task_counts (category TEXT, status TEXT, count INTEGER)")
+            # IS rather than =, so tasks without a category or status count too
+            pair = "category IS {row}.category AND status IS {row}.status"
+            count_new = (
+                f"INSERT INTO task_counts SELECT NEW.category, NEW.status, 0 "
+                f"WHERE NOT EXISTS (SELECT 1 FROM task_counts WHERE {pair.format(row='NEW')}); "
+                f"UPDATE task_counts SET count = count + 1 WHERE {pair.format(row='NEW')}"
+            )
+            for name, event, body in (
+                # The row an INSERT OR REPLACE is about to overwrite
+                ("uncount_replaced", "BEFORE INSERT",
+                 "UPDATE task_counts SET count = count - 1 WHERE rowid IN ("
+                 "SELECT task_counts.rowid FROM task_counts JOIN tasks ON "
+                 "task_counts.category IS tasks.category AND task_counts.status IS tasks.status "
+                 "WHERE tasks.id = NEW.id)"),
+                ("count_insert", "AFTER INSERT", count_new),
+                ("uncount_delete", "AFTER DELETE",
+                 f"UPDATE task_counts SET count = count - 1 WHERE {pair.format(row='OLD')}"),
+            ):
+                self.connection.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} ON tasks BEGIN {body}; END")
+            if not exists:
+                self.connection.execute(
+                    "INSERT INTO task_counts SELECT category, status, COUNT(*) FROM tasks GROUP BY category, status"
+                )
+
+    def create_search_table(self):
+        # Returns False when FTS5 is missing, search then scans the tasks
+        try:
+            with self.connection:
+                exists = self.connection.execute(
+                    "SELECT 1 FROM sqlite_master WHERE name = 'task_search'"
+                ).fetchone() is not None
+                self.connection.execute("CREATE VIRTUAL TABLE IF NOT EXISTS task_search USING fts5(task, notes)")
+                # INSERT OR REPLACE runs no delete trigger, so the insert
+                # triggers drop the old entry first
+                notes = "json_extract({row}.extra, '$.notes')"
+                for name, event, body in (
+                    ("unsearch_replaced", "BEFORE INSERT", "DELETE FROM task_search WHERE rowid = NEW.id"),
+                    ("search_insert", "AFTER INSERT",
+                     f"INSERT INTO task_search (rowid, task, notes) VALUES (NEW.id, NEW.task, {notes.format(row='NEW')})"),
+                    ("unsearch_delete", "AFTER DELETE", "DELETE FROM task_search WHERE rowid = OLD.id"),
+                ):
+                    self.connection.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} ON tasks BEGIN {body}; END")
+                if not exists:
+                    self.connection.execute(
+                        f"INSERT INTO task_search (rowid, task, notes) SELECT id, task, {notes.format(row='tasks')} FROM tasks"
+                    )
+            return True
+        except sqlite3.OperationalError:
+            return False
+
+    def to_row(self, task):
+        extra = {key: value for key, value in task.items() if key not in self.COLUMNS}
+        return tuple(task.get(column) for column in self.COLUMNS) + (json.dumps(extra) if extra else None,)
+
+    def to_task(self, row):
+        task = {column: value for column, value in zip(self.COLUMNS, row) if value is not None}
+        if row[-1]:
+            task.update(json.loads(row[-1]))
+        return task
+
+    def select(self, where="", params=(), order="id"):
+        cursor = self.connection.execute(f"SELECT * FROM tasks {where} ORDER BY {order}", params)
+        return [self.to_task(row) for row in cursor]
+
+    def next_task_id(self):
+        task_id = self.next_id
+        self.next_id += 1
+        return task_id
+
+    def newest_version(self):
+        return self.connection.execute("SELECT MAX(version) FROM task_changes").fetchone()[0] or 0
+
+    def write(self, statement, rows):
+        # Holds the write lock from the start, so the change-log versions
+        # between the two reads are this write's own and poll_changes can
+        # leave them out
+        with self.connection:
+            self.connection.execute("BEGIN IMMEDIATE")
+            after = self.newest_version()
+            self.connection.executemany(statement, rows)
+            last = self.newest_version()
+        if after == self.version:
+            # Nobody else wrote since the last poll
+            self.version = last
+        elif last > after:
+            self.own_changes.append((after, last))
+
+    def add(self, task):
+        try:
+            self.write("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [self.to_row(task)])
+        except sqlite3.IntegrityError:
+            # Another instance took this id since next_task_id, use the next free one
+            max_id = self.connection.execute("SELECT MAX(id) FROM tasks").fetchone()[0]
+            self.next_id = max(self.next_id, max_id + 1)
+            task["id"] = self.next_task_id()
+            self.write("INSERT INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [self.to_row(task)])
+
+    def update(self, task):
+        self.write("INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [self.to_row(task)])
+
+    def delete(self, task):
+        self.write("DELETE FROM tasks WHERE id = ?", [(task["id"],)])
+
+    def delete_many(self, tasks):
+        self.write("DELETE FROM tasks WHERE id = ?", [(task["id"],) for task in tasks])
+
+    def get(self, task_id):
+        tasks = self.select("WHERE id = ?", (task_id,))
+        return tasks[0] if tasks else None
+
+    def close(self):
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    def poll_changes(self):
+        # data_version only moves when another connection commits
+        data_version = self.connection.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self.data_version:
+            return []
+        self.data_version = data_version
+        oldest, newest = self.connection.execute("SELECT MIN(version), MAX(version) FROM task_changes").fetchone()
+        if newest is None or newest <= self.version:
+            return []
+        own_changes, self.own_changes = self.own_changes, []
+        if oldest > self.version + 1:
+            # The log was pruned past what this instance has seen
+            self.version = newest
+            return None
+        task_ids = dict.fromkeys(
+            task_id for version, task_id in self.connection.execute(
+                "SELECT version, task_id FROM task_changes WHERE version > ? AND version <= ? ORDER BY version",
+                (self.version, newest)
+            )
+            if not any(after < version <= last for after, last in own_changes)
+        )
+        self.version = newest
+        changes = []
+        for task_id in task_ids:
+            row = self.connection.execute("SELECT * FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                changes.append({"op": "delete", "id": task_id})
+            else:
+                changes.append({"op": "update", "task": self.to_task(row)})
+                self.next_id = max(self.next_id, task_id + 1)
+        return changes
+
+    def all_tasks(self):
+        return self.select()
+
+    def category_tasks(self, category):
+        return self.select("WHERE category = ?", (category,))
+
+    def completed_tasks(self):
+        return self.select("WHERE status = ?", ("Completed",))
+
+    def category_status_counts(self):
+        cursor = self.connection.execute("SELECT category, status, count FROM task_counts WHERE count > 0")
+        return {(category, status): count for category, status, count in cursor}
+
+    def count_due(self, due_date):
+        return self.connection.execute("SELECT COUNT(*) FROM tasks WHERE due_date = ?", (due_date,)).fetchone()[0]
+
+    def search(self, query, limit=None):
+        if not self.full_text:
+            return super().search(query, limit)
+        prefixes = search_words(query)
+        if not prefixes:
+            return []
+        match = " ".join('"' + prefix.replace('"', '""') + '"*' for prefix in prefixes)
+        # Joined from the FTS side, whose rows already come in rowid order
+        cursor = self.connection.execute(
+            "SELECT tasks.* FROM task_search JOIN tasks ON tasks.id = task_search.rowid "
+            "WHERE task_search MATCH ? ORDER BY task_search.rowid LIMIT ?",
+            (match, -1 if limit is None else limit)
+        )
+        return [self.to_task(row) for row in cursor]
+
+    def due_clause(self, start, end):
+        # A range scan over idx_tasks_due_date, empty due dates never match
+        return "WHERE due_date BETWEEN ? AND ?", (start or "0", end or "9")
+
+    def count_due_between(self, start, end):
+        where, params = self.due_clause(start, end)
+        return self.connection.execute(f"SELECT COUNT(*) FROM tasks {where}", params).fetchone()[0]
+
+    def count_overdue(self, today):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM tasks WHERE due_date >= '0' AND due_date < ? AND status != 'Completed'",
+            (today,)
+        ).fetchone()[0]
+
+# Layout of tasks.bin, all little-endian:
+#   header
+#   records      fixed width, grouped by category, fields are string ids
+#   strings      (count + 1) offsets followed by the UTF-8 blob
+#   categories   (name string id, first record, record count) per category
+#   ids          (task id, record position) sorted by task id
+BINARY_MAGIC = b"TDB1"
+BINARY_HEADER = struct.Struct("<4sIIIQQQ")
+BINARY_RECORD = struct.Struct("<8I")
+BINARY_FIELDS = ("task", "due_date", "priority", "category", "status", "created_date")
+BINARY_PAIR = struct.Struct("<II")
+BINARY_CATEGORY = struct.Struct("<III")
+NO_STRING = 0xFFFFFFFF
+
+def write_task_file(tasks, path):
+    strings = {}
+    string_list = []
+
+    def intern(value):
+        if value is None:
+            return NO_STRING
+        if value not in strings:
+            strings[value] = len(string_list)
+            string_list.append(value)
+        return strings[value]
+
+    # Group records by category so a page reads one contiguous range
+    by_category = {}
+    for task in tasks:
+        by_category.setdefault(task.get("category", "My Day"), []).append(task)
+
+    records = bytearray()
+    categories = []
+    id_pairs = []
+    for category, category_tasks in by_category.items():
+        categories.append((intern(category), len(id_pairs), len(category_tasks)))
+        for task in category_tasks:
+            extra = {key: value for key, value in task.items() if key != "id" and key not in BINARY_FIELDS}
+            records += BINARY_RECORD.pack(
+                task["id"],
+                *(intern(task.get(field)) for field in BINARY_FIELDS),
+                intern(json.dumps(extra)) if extra else NO_STRING
+            )
+            id_pairs.append((task["id"], len(id_pairs)))
+
+    blob = bytearray()
+    offsets = [0]
+    for value in string_list:
+        blob += value.encode("utf-8")
+        offsets.append(len(blob))
+
+    strings_offset = BINARY_HEADER.size + len(records)
+    categories_offset = strings_offset + 4 * len(offsets) + len(blob)
+    ids_offset = categories_offset + BINARY_CATEGORY.size * len(categories)
+    with open(path, "wb") as file:
+        file.write(BINARY_HEADER.pack(
+            BINARY_MAGIC, len(id_pairs), len(string_list), len(categories),
+            strings_offset, categories_offset, ids_offset
+        ))
+        file.write(records)
+        file.write(struct.pack(f"<{len(offsets)}I", *offsets))
+        file.write(blob)
+        for category in categories:
+            file.write(BINARY_CATEGORY.pack(*category))
+        for pair in sorted(id_pairs):
+            file.write(BINARY_PAIR.pack(*pair))
+
+class MappedTaskFile:
+    """Read-only view of tasks.bin through mmap.
+
+    Nothing is decoded up front. Records and strings are unpacked only when
+    a category page, a count or an id lookup needs them.
+    """
+
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, self.count, string_count, category_count,
+         self.strings_offset, categories_offset, self.ids_offset) = BINARY_HEADER.unpack_from(self.map, 0)
+        if magic != BINARY_MAGIC:
+            raise ValueError(f"{path} is not a task file")
+        self.blob_offset = self.strings_offset + 4 * (string_count + 1)
+        self.strings = {}
+        self.categories = {}
+        self.counts = None  # Counted on first use, the file never changes
+        for i in range(category_count):
+            name, first, count = BINARY_CATEGORY.unpack_from(self.map, categories_offset + i * BINARY_CATEGORY.size)
+            self.categories[self.string(name)] = (first, count)
+
+    def close(self):
+        self.map.close()
+        self.file.close()
+
+    def string(self, index):
+        if index == NO_STRING:
+            return None
+        if index not in self.strings:
+            start, end = struct.unpack_from("<II", self.map, self.strings_offset + 4 * index)
+            self.strings[index] = self.map[self.blob_offset + start:self.blob_offset + end].decode("utf-8")
+        return self.strings[index]
+
+    def record(self, position):
+        return BINARY_RECORD.unpack_from(self.map, BINARY_HEADER.size + position * BINARY_RECORD.size)
+
+    def task(self, position):
+        task_id, *fields, extra = self.record(position)
+        task = {"id": task_id}
+        for name, index in zip(BINARY_FIELDS, fields):
+            if index != NO_STRING:
+                task[name] = self.string(index)
+        if extra != NO_STRING:
+            task.update(json.loads(self.string(extra)))
+        return task
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for position in range(self.count):
+            yield self.task(position)
+
+    def category_tasks(self, category):
+        first, count = self.categories.get(category, (0, 0))
+        return [self.task(position) for position in range(first, first + count)]
+
+    def id_at(self, index):
+        return BINARY_PAIR.unpack_from(self.map, self.ids_offset + index * BINARY_PAIR.size)
+
+    def get(self, task_id):
+        # Binary search over the sorted id index
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.id_at(middle)[0] < task_id:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            found_id, position = self.id_at(low)
+            if found_id == task_id:
+                return self.task(position)
+        return None
+
+    def max_id(self):
+        return self.id_at(self.count - 1)[0] if self.count else 0
+
+    def completed_tasks(self, before=None):
+        # Completed records, or only those finished before a day. Status
+        # and created date are read off the record, so only the candidates
+        # get decoded
+        tasks = []
+        records = BINARY_RECORD.iter_unpack(self.map[BINARY_HEADER.size:self.strings_offset])
+        for position, fields in enumerate(records):
+            if self.string(fields[5]) != "Completed":
+                continue
+            if before is not None and fields[7] == NO_STRING and (self.string(fields[6]) or "") >= before:
+                # No extra fields means no completed date to go by
+                continue
+            task = self.task(position)
+            if before is None or finished_before(task, before):
+                tasks.append(task)
+        return tasks
+
+    def key_counts(self):
+        # (category, status, due date) -> number of tasks. Counted once on
+        # string ids, only the distinct names get decoded
+        if self.counts is None:
+            counts = {}
+            for fields in BINARY_RECORD.iter_unpack(self.map[BINARY_HEADER.size:self.strings_offset]):
+                key = (fields[4], fields[5], fields[2])
+                counts[key] = counts.get(key, 0) + 1
+            self.counts = {
+                (self.string(category), self.string(status), self.string(due_date)): count
+                for (category, status, due_date), count in counts.items()
+            }
+        return self.counts
+
+def json_to_binary(json_path=TASKS_FILE, binary_path=BINARY_FILE, journal_path=JOURNAL_FILE):
+    store = JsonTaskStore(json_path, journal_path)
+    write_task_file(store.load(), binary_path)
+
+def binary_to_json(binary_path=BINARY_FILE, json_path=TASKS_FILE):
+    task_file = MappedTaskFile(binary_path)
+    try:
+        tasks = list(task_file)
+    finally:
+        task_file.close()
+    with open(json_path, "w") as file:
+        json.dump(tasks, file, indent=4)
+
+class BinaryTaskStore(TaskStore):
+    """Tasks in tasks.bin, read through mmap, with a journal of changes.
+
+    The binary file is never edited in place. Changes are journaled and kept
+    in a small overlay dict until compaction writes a fresh file.
+    """
+
+    def __init__(self, path=BINARY_FILE, journal_path=BINARY_JOURNAL_FILE,
+                 import_path=TASKS_FILE, import_journal_path=JOURNAL_FILE, compact_every=1000):
+        self.path = path
+        self.journal_path = journal_path
+        self.import_path = import_path
+        self.import_journal_path = import_journal_path
+        self.compact_every = compact_every
+        self.task_file = None
+        self.changes = {}  # task id -> changed task, None when deleted
+        self.pending = 0
+        self.next_id = 1
+
+    def load(self):
+        if not os.path.exists(self.path):
+            json_to_binary(self.import_path, self.path, self.import_journal_path)
+        self.task_file = MappedTaskFile(self.path)
+        self.changes = {}
+        self.pending = 0
+        for record, _ in read_journal(self.journal_path):
+            if record["op"] == "delete":
+                self.changes[record["id"]] = None
+            else:
+                self.changes[record["task"]["id"]] = record["task"]
+            self.pending += 1
+        self.next_id = max([self.task_file.max_id()] + list(self.changes)) + 1
+
+    def next_task_id(self):
+        task_id = self.next_id
+        self.next_id += 1
+        return task_id
+
+    def add(self, task):
+        self.record("add", task)
+
+    def update(self, task):
+        self.record("update", task)
+
+    def delete(self, task):
+        self.record("delete", task)
+
+    def get(self, task_id):
+        if task_id in self.changes:
+            return self.changes[task_id]
+        return self.task_file.get(task_id)
+
+    def record(self, op, task):
+        self.changes[task["id"]] = None if op == "delete" else task
+        append_journal(self.journal_path, op, task)
+        self.pending += 1
+        if self.pending >= self.compact_every:
+            self.compact()
+
+    def save(self):
+        # Without journaled changes tasks.bin is already up to date
+        if self.changes:
+            self.compact()
+
+    def compact(self):
+        tasks = self.all_tasks()
+        self.task_file.close()
+        temp_path = self.path + ".tmp"
+        write_task_file(tasks, temp_path)
+        os.replace(temp_path, self.path)
+        open(self.journal_path, "w").close()
+        self.task_file = MappedTaskFile(self.path)
+        self.changes = {}
+        self.pending = 0
+
+    def close(self):
+        if self.task_file is not None:
+            self.task_file.close()
+            self.task_file = None
+
+    def all_tasks(self):
+        tasks = []
+        for task in self.task_file:
+            task = self.changes.get(task["id"], task)
+            if task is not None:
+                tasks.append(task)
+        # Tasks added since the last compaction
+        tasks.extend(task for task_id, task in self.changes.items()
+                     if task is not None and self.task_file.get(task_id) is None)
+        return tasks
+
+    def category_tasks(self, category):
+        tasks = []
+        file_ids = set()
+        for task in self.task_file.category_tasks(category):
+            file_ids.add(task["id"])
+            task = self.changes.get(task["id"], task)
+            if task is not None and task.get("category") == category:
+                tasks.append(task)
+        # Tasks added since the last compaction, or moved into this category
+        tasks.extend(task for task_id, task in self.changes.items()
+                     if task is not None and task_id not in file_ids and task.get("category") == category)
+        return tasks
+
+    def with_changes(self, tasks, keep):
+        # File tasks with the overlay applied, changed tasks are kept if
+        # they still match
+        tasks = [task for task in tasks if task["id"] not in self.changes]
+        tasks.extend(task for task in self.changes.values() if task is not None and keep(task))
+        return tasks
+
+    def completed_tasks(self):
+        return self.with_changes(self.task_file.completed_tasks(),
+                                 lambda task: task.get("status") == "Completed")
+
+    def completed_before(self, cutoff):
+        return self.with_changes(self.task_file.completed_tasks(cutoff),
+                                 lambda task: task.get("status") == "Completed" and finished_before(task, cutoff))
+
+    def key_counts(self):
+        # The file's counts with the overlay of changes applied on top
+        counts = dict(self.task_file.key_counts())
+        for task_id, task in self.changes.items():
+            for old_task, step in ((self.task_file.get(task_id), -1), (task, 1)):
+                if old_task is not None:
+                    key = (old_task.get("category"), old_task.get("status"), old_task.get("due_date"))
+                    counts[key] = counts.get(key, 0) + step
+        return counts
+
+    def category_status_counts(self):
+        counts = {}
+        for (category, status, due_date), count in self.key_counts().items():
+            counts[(category, status)] = counts.get((category, status), 0) + count
+        return {key: count for key, count in counts.items() if count}
+
+    def count_due(self, due_date):
+        return self.count_due_between(due_date, due_date)
+
+    def count_due_between(self, start, end):
+        return sum(
+            count for (category, status, due_date), count in self.key_counts().items()
+            if due_date and (start is None or due_date >= start) and (end is None or due_date <= end)
+        )
+
+    def count_overdue(self, today):
+        return sum(
+            count for (category, status, due_date), count in self.key_counts().items()
+            if due_date and due_date < today and status != "Completed"
+        )
+
+class ShardedTaskStore(TaskStore):
+    """One journaled JSON shard per category plus a small manifest.
+
+    A shard is read the first time its category page asks for it, and a
+    change only touches that category's shard. The manifest keeps status and
+    due date counts per category, plus due date counts of the tasks not yet
+    completed for the overdue total, so the dashboard never opens a shard.
+    Completed tasks are also counted by the day they were finished, so the
+    daily archive pass only opens shards that have something to archive.
+    """
+
+    def __init__(self, folder=SHARDS_FOLDER, import_path=TASKS_FILE, import_journal_path=JOURNAL_FILE):
+        self.folder = folder
+        self.manifest_path = os.path.join(folder, "manifest.json")
+        self.import_path = import_path
+        self.import_journal_path = import_journal_path
+        self.manifest = {"next_id": 1, "categories": {}}
+        self.shards = {}  # category -> loaded JsonTaskStore
+        self.known = {}   # task id -> count_key(task) as last counted
+
+    def load(self):
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r") as file:
+                self.manifest = json.load(file)
+            for category, entry in self.manifest["categories"].items():
+                if "open_due_counts" not in entry or "completed_days" not in entry:
+                    # Written before these counts existed, recount once
+                    entry.setdefault("open_due_counts", {})
+                    entry.setdefault("completed_days", {})
+                    self.shard(category)
+        else:
+            os.makedirs(self.folder, exist_ok=True)
+            self.import_tasks()
+
+    def import_tasks(self):
+        # Split an existing tasks.json into shards on first run
+        tasks = []
+        if os.path.exists(self.import_path):
+            tasks = JsonTaskStore(self.import_path, self.import_journal_path).load()
+        by_category = {}
+        for task in tasks:
+            by_category.setdefault(task["category"], []).append(task)
+        for category, category_tasks in by_category.items():
+            shard = self.shard(category)
+            shard.set_tasks(category_tasks)
+            shard.compact()
+            self.count_shard(category, category_tasks)
+        self.manifest["next_id"] = max((task["id"] for task in tasks), default=0) + 1
+        self.write_manifest()
+
+    def write_manifest(self):
+        temp_path = self.manifest_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.manifest, file)
+        os.replace(temp_path, self.manifest_path)
+
+    def entry(self, category):
+        # Manifest entry for a category, created on first use
+        categories = self.manifest["categories"]
+        if category not in categories:
+            name = "".join(char if char.isalnum() else "_" for char in category.lower())
+            categories[category] = {
+                "file": f"{name}_{len(categories)}", "status_counts": {}, "due_counts": {},
+                "open_due_counts": {}, "completed_days": {}
+            }
+        return categories[category]
+
+    def shard(self, category):
+        if category not in self.shards:
+            path = os.path.join(self.folder, self.entry(category)["file"])
+            shard = JsonTaskStore(path + ".json", path + ".journal")
+            shard.load()
+            self.shards[category] = shard
+            self.count_shard(category, shard.all_tasks())
+        return self.shards[category]
+
+    def count_key(self, task):
+        # What the manifest counts a task by: status, due date and the day
+        # a completed task was finished, None while it is open
+        done_day = None
+        if task.get("status") == "Completed":
+            done_day = (task.get("completed_date") or task.get("created_date") or "")[:10]
+        return task.get("status"), task.get("due_date"), done_day
+
+    def count_shard(self, category, tasks):
+        # Recount a freshly read shard, which also repairs counts left
+        # behind by a crash between a shard write and a manifest write
+        entry = self.entry(category)
+        counted = {"status_counts": {}, "due_counts": {}, "open_due_counts": {}, "completed_days": {}}
+        for task in tasks:
+            self.known[task["id"]] = self.count_key(task)
+            self.adjust(counted, *self.known[task["id"]], 1)
+        if any(entry.get(name) != counts for name, counts in counted.items()):
+            entry.update(counted)
+            self.write_manifest()
+
+    def adjust_counts(self, category, status, due_date, done_day, step):
+        self.adjust(self.entry(category), status, due_date, done_day, step)
+
+    def adjust(self, entry, status, due_date, done_day, step):
+        open_due_date = due_date if status != "Completed" else None
+        for counts, key in ((entry["status_counts"], status), (entry["due_counts"], due_date),
+                            (entry["open_due_counts"], open_due_date), (entry["completed_days"], done_day)):
+            if key is None:
+                continue
+            counts[key] = counts.get(key, 0) + step
+            if counts[key] == 0:
+                del counts[key]
+
+    def next_task_id(self):
+        task_id = self.manifest["next_id"]
+        self.manifest["next_id"] += 1
+        return task_id
+
+    def add(self, task):
+        self.shard(task["category"]).add(task)
+        self.known[task["id"]] = self.count_key(task)
+        self.adjust_counts(task["category"], *self.known[task["id"]], 1)
+        self.write_manifest()
+
+    def update(self, task):
+        self.shard(task["category"]).update(task)
+        old = self.known.get(task["id"])
+        if old is not None:
+            self.adjust_counts(task["category"], *old, -1)
+        self.known[task["id"]] = self.count_key(task)
+        self.adjust_counts(task["category"], *self.known[task["id"]], 1)
+        self.write_manifest()
+
+    def delete(self, task):
+        self.delete_many([task])
+
+    def delete_many(self, tasks):
+        # One manifest write for the whole batch
+        for task in tasks:
+            self.shard(task["category"]).delete(task)
+            old = self.known.pop(task["id"], None)
+            if old is not None:
+                self.adjust_counts(task["category"], *old, -1)
+        self.write_manifest()
+
+    def get(self, task_id):
+        # A page only asks for tasks of its own, already loaded, shard
+        for shard in self.shards.values():
+            task = shard.get(task_id)
+            if task is not None:
+                return task
+        return None
+
+    def save(self):
+        for shard in self.shards.values():
+            shard.save()
+        self.write_manifest()
+
+    def all_tasks(self):
+        tasks = []
+        for category in list(self.manifest["categories"]):
+            tasks.extend(self.shard(category).all_tasks())
+        return tasks
+
+    def category_tasks(self, category):
+        return self.shard(category).all_tasks()
+
+    def completed_tasks(self):
+        # Only shards with completed tasks are opened
+        tasks = []
+        for category, entry in list(self.manifest["categories"].items()):
+            if entry["completed_days"]:
+                tasks.extend(self.shard(category).completed_tasks())
+        return tasks
+
+    def completed_before(self, cutoff):
+        # Only shards with something finished before the cutoff are opened
+        tasks = []
+        for category, entry in list(self.manifest["categories"].items()):
+            if any(day < cutoff for day in entry["completed_days"]):
+                tasks.extend(self.shard(category).completed_before(cutoff))
+        return tasks
+
+    def category_status_counts(self):
+        return {
+            (category, status): count
+            for category, entry in self.manifest["categories"].items()
+            for status, count in entry["status_counts"].items()
+        }
+
+    def count_due(self, due_date):
+        return sum(entry["due_counts"].get(due_date, 0) for entry in self.manifest["categories"].values())
+
+    def count_due_between(self, start, end):
+        return sum(
+            count
+            for entry in self.manifest["categories"].values()
+            for due_date, count in entry["due_counts"].items()
+            if (start is None or due_date >= start) and (end is None or due_date <= end)
+        )
+
+    def count_overdue(self, today):
+        return sum(
+            count
+            for entry in self.manifest["categories"].values()
+            for due_date, count in entry["open_due_counts"].items()
+            if due_date and due_date < today
+        )
+
+class TaskArchive:
+    """Cold storage for tasks completed long ago.
+
+    Archived tasks are appended to a gzip file as JSON lines and never
+    rewritten. A small summary file keeps their counts, so the dashboard
+    totals include them without opening the archive, and the id and
+    creation time of each, so a task is never archived twice.
+    """
+
+    def __init__(self, path=ARCHIVE_FILE, summary_path=ARCHIVE_SUMMARY_FILE):
+        self.path = path
+        self.summary_path = summary_path
+        # Held by the instance running the daily pass
+        self.lock = FileLock(path + ".lock")
+        self.reload()
+
+    def reload(self):
+        # Another instance may have archived since the summary was read
+        try:
+            with open(self.summary_path, "r") as file:
+                self.summary = json.load(file)
+        except FileNotFoundError:
+            self.summary = {"last_run": None, "status_counts": {}, "due_counts": {}}
+        self.summary.setdefault("archived", {})
+
+    def is_due(self, today):
+        return self.summary["last_run"] != today
+
+    def has(self, task):
+        # By id and creation time, as an id can be handed out again once
+        # the task holding it has been archived
+        return self.summary["archived"].get(str(task["id"]), MISSING) == task.get("created_date")
+
+    def archive(self, tasks, today):
+        if tasks:
+            # Every call adds a new gzip member, earlier ones stay untouched
+            with gzip.open(self.path, "at", encoding="utf-8") as file:
+                for task in tasks:
+                    file.write(json.dumps(task, default=Task.to_dict) + "\n")
+        for task in tasks:
+            self.summary["archived"][str(task["id"])] = task.get("created_date")
+            status_counts = self.summary["status_counts"].setdefault(task.get("category"), {})
+            status_counts[task.get("status")] = status_counts.get(task.get("status"), 0) + 1
+            if task.get("due_date") is not None:
+                due_counts = self.summary["due_counts"]
+                due_counts[task["due_date"]] = due_counts.get(task["due_date"], 0) + 1
+        self.summary["last_run"] = today
+        temp_path = self.summary_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.summary, file)
+        os.replace(temp_path, self.summary_path)
+
+    def iter_category(self, category):
+        # Streams archived tasks of one category, oldest archive run first
+        try:
+            with gzip.open(self.path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    task = json.loads(line)
+                    if task.get("category") == category:
+                        yield task
+        except FileNotFoundError:
+            return
+
+    def category_status_counts(self):
+        return {
+            (category, status): count
+            for category, status_counts in self.summary["status_counts"].items()
+            for status, count in status_counts.items()
+        }
+
+    def count_due(self, due_date):
+        return self.summary["due_counts"].get(due_date, 0)
+
+    def count_due_between(self, start, end):
+        return sum(
+            count for due_date, count in self.summary["due_counts"].items()
+            if (start is None or due_date >= start) and (end is None or due_date <= end)
+        )
+
+STORE_BACKENDS = {
+    "json": JsonTaskStore,
+    "sqlite": SQLiteTaskStore,
+    "binary": BinaryTaskStore,
+    "sharded": ShardedTaskStore,
+}
+
+class VirtualTreeview(ttk.Treeview):
+    """A flat Treeview that only holds the rows currently in view.
+
+    The rows live in a plain list that is the source of truth; insert,
+    delete, exists, index, item and get_children work on that list like
+    they do on a Treeview. Only the rows from ``top`` that fit the widget,
+    plus VIRTUAL_OVERSCAN, are materialized, and scrolling swaps rows in
+    and out at the edges instead of moving a view over all of them.
+    """
+
+    def __init__(self, master=None, **kw):
+        self.scroll_command = kw.pop("yscrollcommand", None)
+        super().__init__(master, **kw)
+        self.rows = []  # iids in display order
+        self.options = {}  # iid -> values and tags
+        self.positions = {}  # iid -> index in rows, None after a middle edit
+        self.top = 0
+        self.render_pending = None  # after_idle id of a queued render
+        self.row_height = 20  # Measured on a drawn row by render
+        self.heading_height = 0
+        self.border = 0
+        self.bind("<Configure>", lambda event: self.render())
+        # Keys move the focus through the whole list, not just the rows in the widget
+        for key, step in (("<Up>", -1), ("<Down>", 1), ("<Prior>", "page up"), ("<Next>", "page down"),
+                          ("<Home>", "first"), ("<End>", "last")):
+            self.bind(key, lambda event, step=step: self.move_focus(step))
+        self.bind("<MouseWheel>", lambda event: self.scroll_rows(-3 if event.delta > 0 else 3))
+        self.bind("<Button-4>", lambda event: self.scroll_rows(-3))
+        self.bind("<Button-5>", lambda event: self.scroll_rows(3))
+
+    def destroy(self):
+        # A page dropped from the page cache may still have a render queued
+        if self.render_pending is not None:
+            self.after_cancel(self.render_pending)
+            self.render_pending = None
+        super().destroy()
+
+    def configure(self, cnf=None, **kw):
+        # The scrollbar follows the rows in the list, not the widget
+        if "yscrollcommand" in kw:
+            self.scroll_command = kw.pop("yscrollcommand")
+        return super().configure(cnf, **kw)
+
+    config = configure
+
+    def position(self, iid):
+        if self.positions is None:
+            self.positions = {row: index for index, row in enumerate(self.rows)}
+        return self.positions.get(iid)
+
+    def insert(self, parent, index, iid=None, **kw):
+        iid = str(iid)
+        self.options[iid] = kw
+        if index == "end" or index >= len(self.rows):
+            if self.positions is not None:
+                self.positions[iid] = len(self.rows)
+            self.rows.append(iid)
+        else:
+            self.rows.insert(index, iid)
+            self.positions = None
+        self.schedule_render()
+        return iid
+
+    def delete(self, *items):
+        gone = set(items)
+        if len(gone) >= len(self.rows) and gone.issuperset(self.rows):
+            # Clearing the whole list, as a refresh does
+            self.rows = []
+            self.options = {}
+            self.positions = {}
+        elif len(gone) > 1:
+            # One pass however many go
+            self.rows = [iid for iid in self.rows if iid not in gone]
+            self.positions = None
+            for iid in gone:
+                self.options.pop(iid, None)
+        elif gone:
+            index = self.position(items[0])
+            if index is not None:
+                del self.rows[index]
+                del self.options[items[0]]
+                self.positions = None
+        shown = [iid for iid in super().get_children() if iid in gone]
+        if shown:
+            super().delete(*shown)
+        self.schedule_render()
+
+    def reconcile(self, rows):
+        # Makes the list rows, (iid, options) pairs in order, touching only
+        # the rows that were added, removed, moved or changed
+        anchor = self.rows[self.top] if self.top < len(self.rows) else None
+        old_options = self.options
+        self.rows = [iid for iid, options in rows]
+        self.options = dict(rows)
+        self.positions = None
+        shown = super().get_children()
+        gone = [iid for iid in shown if iid not in self.options]
+        if gone:
+            super().delete(*gone)
+        for iid in shown:
+            options = self.options.get(iid)
+            if options is not None and options != old_options[iid]:
+                super().item(iid, **options)
+        # Rows added or removed above the view don't scroll it
+        if anchor in self.options:
+            self.top = self.position(anchor)
+        self.schedule_render()
+
+    def exists(self, item):
+        return item in self.options
+
+    def index(self, item):
+        return self.position(item)
+
+    def get_children(self, item=None):
+        return tuple(self.rows)
+
+    def item(self, item, option=None, **kw):
+        if kw:
+            self.options[item].update(kw)
+        if super().exists(item):
+            return super().item(item, option, **kw)
+        if not kw:
+            options = {"values": list(self.options[item].get("values", ())), "tags": self.options[item].get("tags", "")}
+            return options if option is None else options[option]
+
+    def see(self, item):
+        # Scroll just far enough that the row is fully in view
+        index = self.position(item)
+        if index is not None:
+            visible = self.visible_rows()
+            if index < self.top:
+                self.top = index
+                self.render()
+            elif index >= self.top + visible:
+                self.top = index - visible + 1
+                self.render()
+
+    def move_focus(self, step):
+        if not self.rows:
+            return "break"
+        visible = self.visible_rows()
+        index = self.position(super().focus())
+        if index is None:
+            index = self.top
+        if step == "first":
+            index = 0
+        elif step == "last":
+            index = len(self.rows) - 1
+        elif step in ("page up", "page down"):
+            index += visible if step == "page down" else -visible
+        else:
+            index += step
+        iid = self.rows[max(0, min(index, len(self.rows) - 1))]
+        self.see(iid)
+        super().focus(iid)
+        self.selection_set(iid)
+        return "break"
+
+    def visible_rows(self):
+        # Rows that fit whole below the heading
+        return max(1, (self.winfo_height() - self.heading_height - self.border) // self.row_height)
+
+    def yview(self, *args):
+        # Scrollbar commands: moveto fraction, or scroll count units/pages
+        visible = self.visible_rows()
+        if not args:
+            total = max(len(self.rows), 1)
+            return self.top / total, min(1.0, (self.top + visible) / total)
+        if args[0] == "moveto":
+            self.top = int(float(args[1]) * len(self.rows))
+            self.render()
+        elif args[0] == "scroll":
+            step = visible if args[2] == "pages" else 1
+            self.scroll_rows(int(args[1]) * step)
+
+    def scroll_rows(self, count):
+        self.top += count
+        self.render()
+        return "break"
+
+    def schedule_render(self):
+        # Many inserts in a row, such as a page refresh, draw once
+        if self.render_pending is None:
+            self.render_pending = self.after_idle(self.render)
+
+    def render(self):
+        if self.render_pending is not None:
+            # Drawing now stands in for the queued render too
+            self.after_cancel(self.render_pending)
+            self.render_pending = None
+        visible = self.visible_rows()
+        self.top = max(0, min(self.top, len(self.rows) - visible))
+        window = self.rows[self.top:self.top + visible + VIRTUAL_OVERSCAN]
+        shown = super().get_children()
+        keep = set(window).intersection(shown)
+        gone = [iid for iid in shown if iid not in keep]
+        if gone:
+            super().delete(*gone)
+        # Rows kept from the last window are usually already in order, only
+        # the ones scrolled into view are inserted and reordered ones moved
+        order = [iid for iid in shown if iid in keep]
+        for position, iid in enumerate(window):
+            if position < len(order) and order[position] == iid:
+                continue
+            if iid in keep:
+                super().move(iid, "", position)
+                order.remove(iid)
+            else:
+                super().insert("", position, iid=iid, **self.options[iid])
+            order.insert(position, iid)
+        # The widget itself must not scroll, the window already starts at top
+        self.tk.call(self._w, "yview", "moveto", 0)
+        if self.scroll_command is not None:
+            self.scroll_command(*self.yview())
+        if window:
+            # The first row sits right below the heading and inside the
+            # border, its box gives all three; draw again if they were off
+            box = super().bbox(window[0])
+            if box and (box[1], box[3], box[0]) != (self.heading_height, self.row_height, self.border):
+                self.heading_height, self.row_height, self.border = box[1], box[3], box[0]
+                self.schedule_render()
+
 class CategoryPage(ttk.Frame):
     def __init__(self, parent, category_name, main_app):
         super().__init__(parent)
         self.category_name = category_name
         self.main_app = main_app
+        self.archived_tasks = None  # Reader paging through archived tasks
         
         # Configure modern theme colors
         self.configure(style='Modern.TFrame')
@@ -123,7 +2354,7 @@ class CategoryPage(ttk.Frame):
         
         # Styled Treeview
         columns = ("Complete", "Task", "Due Date", "Priority", "Status")
-        self.task_tree = ttk.Treeview(
+        self.task_tree = VirtualTreeview(
             list_frame,
             columns=columns,
             show="headings",
@@ -170,15 +2401,21 @@ class CategoryPage(ttk.Frame):
         completed_frame = ttk.Frame(self, style='Modern.TFrame')
         completed_frame.pack(fill="both", expand=True, padx=20, pady=(20,0))
 
-        # Modern label for completed tasks
-        ttk.Label(completed_frame, 
+        # Modern label for completed tasks, archived ones are paged in on demand
+        completed_header = ttk.Frame(completed_frame, style='Modern.TFrame')
+        completed_header.pack(fill="x", pady=(0,10))
+        ttk.Label(completed_header, 
                  text="Completed Tasks", 
                  font=("Segoe UI", 14, "bold"),
-                 style='Modern.TLabel').pack(anchor="w", pady=(0,10))
+                 style='Modern.TLabel').pack(side="left")
+        ttk.Button(completed_header,
+                  text="Show Archived",
+                  command=self.show_archived_tasks,
+                  style='Modern.TButton').pack(side="right")
 
         # Styled Treeview for completed tasks
         columns = ("Complete", "Task", "Due Date", "Priority", "Status")
-        self.completed_tree = ttk.Treeview(
+        self.completed_tree = VirtualTreeview(
             completed_frame,
             columns=columns,
             show="headings",
@@ -228,7 +2465,10 @@ class CategoryPage(ttk.Frame):
             
     def add_task(self):
         task = self.task_var.get().strip()
-        if task:
+        if self.main_app.store.loading:
+            # New ids are only safe once every stored id has been seen
+            messagebox.showwarning("Please Wait", "Tasks are still loading, try again in a moment.")
+        elif task:
             try:
                 # Create new task with all required fields
                 new_task = {
@@ -237,11 +2477,11 @@ class CategoryPage(ttk.Frame):
                     "priority": self.priority_var.get(),
                     "category": self.category_name,
                     "status": "Pending",
-                    "created_date": datetime.now().strftime("%Y-%m-%d %H:%M")
+                    "created_date": datetime.now().strftime("%Y-%m-%d %H:%M"),
+                    "id": self.main_app.store.next_task_id()
                 }
                 
-                self.main_app.tasks.append(new_task)
-                self.main_app.save_tasks()
+                self.main_app.record_task_change("add", new_task)
                 self.refresh_tasks()
                 self.task_var.set("")
                 messagebox.showinfo("Success", "Task added successfully!")
@@ -251,18 +2491,17 @@ class CategoryPage(ttk.Frame):
         else:
             messagebox.showwarning("Invalid Input", "Please enter a task!")
             
+    def row_task(self, item):
+        # Row iids are task ids, so a row maps straight to its task
+        return self.main_app.store.get(int(item))
+
     def complete_task(self, item):
-        values = self.task_tree.item(item)['values']
-        task_name = values[1]  # Task is now in second column
-        
-        for task in self.main_app.tasks:
-            if (task["category"] == self.category_name and 
-                task["task"] == task_name and
-                task["status"] != "Completed"):
-                task["status"] = "Completed"
-                self.main_app.save_tasks()
-                self.refresh_tasks()
-                break
+        task = self.row_task(item)
+        if task is not None and task["status"] != "Completed":
+            task["status"] = "Completed"
+            task["completed_date"] = datetime.now().strftime("%Y-%m-%d %H:%M")
+            self.main_app.record_task_change("update", task)
+            self.refresh_tasks()
             
     def edit_task(self):
         selected = self.task_tree.selection()
@@ -290,13 +2529,11 @@ class CategoryPage(ttk.Frame):
             due_date.pack(pady=5)
             
             def save_changes():
-                for task in self.main_app.tasks:
-                    if (task["category"] == self.category_name and 
-                        task["task"] == values[1]):
-                        task["task"] = task_entry.get()
-                        task["due_date"] = due_date.get_date().strftime("%Y-%m-%d")
-                        break
-                self.main_app.save_tasks()
+                task = self.row_task(item)
+                if task is not None:
+                    task["task"] = task_entry.get()
+                    task["due_date"] = due_date.get_date().strftime("%Y-%m-%d")
+                    self.main_app.record_task_change("update", task)
                 self.refresh_tasks()
                 edit_window.destroy()
                 
@@ -311,66 +2548,157 @@ class CategoryPage(ttk.Frame):
         selected = self.task_tree.selection()
         if selected:
             if messagebox.askyesno("Confirm Delete", "Delete this task?"):
-                item = selected[0]
-                values = self.task_tree.item(item)['values']
-                self.main_app.tasks = [
-                    task for task in self.main_app.tasks 
-                    if not (task["category"] == self.category_name and 
-                           task["task"] == values[1])
-                ]
-                self.main_app.save_tasks()
+                task = self.row_task(selected[0])
+                if task is not None:
+                    self.main_app.record_task_change("delete", task)
                 self.refresh_tasks()
                 
     def refresh_tasks(self):
-        # Clear existing tasks
-        for item in self.task_tree.get_children():
-            self.task_tree.delete(item)
-
+        # Bring both trees up to date with the store, only rows that differ
+        # are touched so scroll position and selection stay put
+        rows = {self.task_tree: []}
         if hasattr(self, 'completed_tree'):
-            for item in self.completed_tree.get_children():
-                self.completed_tree.delete(item)
+            rows[self.completed_tree] = []
+            self.archived_tasks = None
         
         try:
             # Filter tasks for current category
-            category_tasks = [
-                task for task in self.main_app.tasks 
-                if task.get("category", "") == self.category_name
-            ]
+            category_tasks = self.main_app.store.category_tasks(self.category_name)
             
-            # Split into active and completed tasks
-            active_tasks = [task for task in category_tasks if task.get("status") != "Completed"]
-            completed_tasks = [task for task in category_tasks if task.get("status") == "Completed"]
-            
-            # Add active tasks to main tree
-            for task in active_tasks:
-                values = (
-                    "☐",
-                    task.get("task", ""),
-                    task.get("due_date", ""),
-                    task.get("priority", "Normal"),
-                    task.get("status", "Pending")
-                )
-                self.task_tree.insert("", "end", values=values)
-
-            # Add completed tasks to completed tree if in My Day category
-            if hasattr(self, 'completed_tree'):
-                for task in completed_tasks:
-                    values = (
-                        "✓",
-                        task.get("task", ""),
-                        task.get("due_date", ""),
-                        task.get("priority", "Normal"),
-                        task.get("status", "Completed")
-                    )
-                    self.completed_tree.insert("", "end", values=values)
+            for task in category_tasks:
+                tree, values = self.task_row(task)
+                if tree is not None:
+                    rows[tree].append((str(task["id"]), {"values": values}))
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error loading tasks: {str(e)}")
+            return
+
+        for tree, tree_rows in rows.items():
+            tree.reconcile(tree_rows)
+
+    def show_archived_tasks(self):
+        # Continue reading the archive where the last page stopped
+        try:
+            if self.archived_tasks is None:
+                self.archived_tasks = self.main_app.archive.iter_category(self.category_name)
+            for task in islice(self.archived_tasks, ARCHIVE_PAGE_SIZE):
+                # A crash while archiving can leave a task in both places
+                if not self.completed_tree.exists(str(task["id"])):
+                    self.insert_task_row(task)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error loading archived tasks: {str(e)}")
+
+    def append_tasks(self, tasks):
+        # Add rows for tasks that finished loading after the page was drawn
+        for task in tasks:
+            if task.get("category", "") == self.category_name:
+                self.insert_task_row(task)
+
+    def apply_changes(self, records):
+        # Merge changes made by another instance row by row, keeping each
+        # changed row where it was
+        trees = [self.task_tree]
+        if hasattr(self, 'completed_tree'):
+            trees.append(self.completed_tree)
+        for record in records:
+            task = record.get("task")
+            iid = str(task["id"] if task is not None else record["id"])
+            old_tree, index = None, "end"
+            for tree in trees:
+                if tree.exists(iid):
+                    old_tree, index = tree, tree.index(iid)
+                    tree.delete(iid)
+            if task is not None and task.get("category", "") == self.category_name:
+                # A row that moved between the trees goes to the end
+                completed = task.get("status") == "Completed"
+                if (old_tree is self.task_tree) == completed:
+                    index = "end"
+                self.insert_task_row(task, index)
+
+    def insert_task_row(self, task, index="end"):
+        tree, values = self.task_row(task)
+        if tree is not None:
+            tree.insert("", index, iid=str(task["id"]), values=values)
+
+    def task_row(self, task):
+        # The tree a task is listed in and its row, tree is None if hidden
+        if task.get("status") != "Completed":
+            # Active tasks go to the main tree
+            values = (
+                "☐",
+                task.get("task", ""),
+                task.get("due_date", ""),
+                task.get("priority", "Normal"),
+                task.get("status", "Pending")
+            )
+            return self.task_tree, values
+        if hasattr(self, 'completed_tree'):
+            # Completed tasks go to the completed tree if in My Day category
+            values = (
+                "✓",
+                task.get("task", ""),
+                task.get("due_date", ""),
+                task.get("priority", "Normal"),
+                task.get("status", "Completed")
+            )
+            return self.completed_tree, values
+        return None, None
+
+class SearchPage(CategoryPage):
+    """Header search results from every category in a single list."""
+
+    def __init__(self, parent, main_app):
+        self.query = ""
+        super().__init__(parent, "Search", main_app)
+
+    def create_page(self):
+        header_frame = ttk.Frame(self, style='Modern.TFrame')
+        header_frame.pack(fill="x", pady=(0, 20))
+        
+        title = ttk.Label(
+            header_frame,
+            text="🔍 Search",
+            font=("Segoe UI", 28, "bold"),
+            style='Modern.TLabel'
+        )
+        title.pack(side="left", padx=20)
+        
+        self.create_tasks_list()
+
+    def refresh_tasks(self):
+        try:
+            # Only the first SEARCH_LIMIT matches are drawn, by id
+            matches = self.main_app.store.search(self.query, SEARCH_LIMIT)
+            self.task_tree.reconcile([(str(task["id"]), {"values": self.task_row(task)[1]})
+                                      for task in matches])
+        except Exception as e:
+            messagebox.showerror("Error", f"Error searching tasks: {str(e)}")
+
+    def append_tasks(self, tasks):
+        # Tasks that finished loading may match, search again
+        self.refresh_tasks()
+
+    def apply_changes(self, records):
+        self.refresh_tasks()
+
+    def task_row(self, task):
+        # Completed tasks stay in the same list, ticked
+        completed = task.get("status") == "Completed"
+        values = (
+            "✓" if completed else "☐",
+            task.get("task", ""),
+            task.get("due_date", ""),
+            task.get("priority", "Normal"),
+            task.get("status", "Pending")
+        )
+        return self.task_tree, values
 
 class DashboardPage(ttk.Frame):
     def __init__(self, parent, main_app):
         super().__init__(parent)
         self.main_app = main_app
+        self.figures = []  # pyplot keeps figures alive until they are closed
         
         # Configure modern theme
         style = ttk.Style()
@@ -411,12 +2739,14 @@ class DashboardPage(ttk.Frame):
         # Create figure with a modern style
         plt.style.use('default')  # Using default style instead of seaborn
         fig, ax = plt.subplots(figsize=(6, 4))
+        self.figures.append(fig)
         fig.patch.set_facecolor('#F5F5F5')
         
         # Calculate completion stats
-        completed = sum(1 for task in self.main_app.tasks 
-                       if task.get("status") == "Completed")
-        pending = len(self.main_app.tasks) - completed
+        counts = self.main_app.category_status_counts()
+        completed = sum(count for (category, status), count in counts.items() 
+                       if status == "Completed")
+        pending = sum(counts.values()) - completed
         
         # Create pie chart with modern colors
         sizes = [completed, pending]
@@ -459,19 +2789,19 @@ class DashboardPage(ttk.Frame):
         
         # Create figure
         fig, ax = plt.subplots(figsize=(6, 4))
+        self.figures.append(fig)
         fig.patch.set_facecolor('#F5F5F5')
         
         # Calculate category stats
         categories = ["My Day", "Important", "Planned", "Personal", "Work", "Shopping"]
         completed_counts = []
         pending_counts = []
+        counts = self.main_app.category_status_counts()
         
         for category in categories:
-            category_tasks = [task for task in self.main_app.tasks 
-                            if task.get("category") == category]
-            completed = sum(1 for task in category_tasks 
-                          if task.get("status") == "Completed")
-            pending = len(category_tasks) - completed
+            completed = counts.get((category, "Completed"), 0)
+            pending = sum(count for (task_category, status), count in counts.items() 
+                          if task_category == category) - completed
             completed_counts.append(completed)
             pending_counts.append(pending)
         
@@ -534,22 +2864,32 @@ class DashboardPage(ttk.Frame):
         summary_frame.pack(fill="x", padx=20, pady=20)
         
         # Calculate statistics
-        total_tasks = len(self.main_app.tasks)
-        completed_tasks = sum(1 for task in self.main_app.tasks 
-                            if task.get("status") == "Completed")
+        counts = self.main_app.category_status_counts()
+        total_tasks = sum(counts.values())
+        completed_tasks = sum(count for (category, status), count in counts.items() 
+                            if status == "Completed")
         completion_rate = (completed_tasks / total_tasks * 100) if total_tasks > 0 else 0
         
         # Today's tasks
-        today = datetime.now().strftime("%Y-%m-%d")
-        today_tasks = sum(1 for task in self.main_app.tasks 
-                         if task.get("due_date") == today)
+        now = datetime.now()
+        today = now.strftime("%Y-%m-%d")
+        today_tasks = self.main_app.count_due(today)
+        overdue_tasks = self.main_app.count_overdue(today)
+        
+        # This week's tasks, Monday to Sunday
+        monday = now - timedelta(days=now.weekday())
+        week_tasks = self.main_app.count_due_between(
+            monday.strftime("%Y-%m-%d"), (monday + timedelta(days=6)).strftime("%Y-%m-%d")
+        )
         
         # Create modern summary labels
         summaries = [
             f"Total Tasks: {total_tasks}",
             f"Completed Tasks: {completed_tasks}",
             f"Completion Rate: {completion_rate:.1f}%",
-            f"Tasks Due Today: {today_tasks}"
+            f"Tasks Due Today: {today_tasks}",
+            f"Overdue: {overdue_tasks}",
+            f"Due This Week: {week_tasks}"
         ]
         
         # Create and style modern labels
@@ -566,16 +2906,34 @@ class DashboardPage(ttk.Frame):
         # Clear existing widgets
         for widget in self.winfo_children():
             widget.destroy()
+        self.close_figures()
             
         # Recreate dashboard
         self.create_dashboard()
 
+    def close_figures(self):
+        for fig in self.figures:
+            plt.close(fig)
+        self.figures = []
+
+    def destroy(self):
+        self.close_figures()
+        super().destroy()
+
 class ModernToDoList:
-    def __init__(self, root):
+    def __init__(self, root, backend=STORE_BACKEND):
         self.root = root
         self.root.title("Modern Task Manager")
         self.root.geometry("1200x800")
         
+        # Open the task store and the archive of old completed tasks
+        self.store = STORE_BACKENDS[backend]()
+        self.archive = TaskArchive()
+        self.load_tasks()
+        if self.task_loader is None:
+            self.archive_old_tasks()
+        self.current_page = "My Day"
+        
         # Apply modern styles
         self.apply_modern_styles()
         
@@ -583,6 +2941,22 @@ class ModernToDoList:
         self.create_modern_sidebar()
         self.create_modern_content()
         
+        # Create pages
+        self.create_pages()
+        
+        # Show default page
+        self.show_page("My Day")
+        
+        # Keep streaming the rest of the tasks into the page from the event loop
+        if self.task_loader is not None:
+            self.root.after(1, self.load_next_batch)
+        
+        # Pick up changes other instances make to the same store
+        self.root.after(STORE_POLL_MS, self.poll_store)
+        
+        # Close the store cleanly when the window goes away
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+        
     def apply_modern_styles(self):
         # Configure modern styles for the application
         style = ttk.Style()
@@ -690,13 +3064,16 @@ class ModernToDoList:
         header = ttk.Frame(content, style="Modern.TFrame")
         header.pack(fill="x", pady=(0, 20))
         
-        search_var = tk.StringVar()
+        # Searches on every keystroke
+        self.search_var = tk.StringVar()
+        self.search_var.trace_add("write", lambda *args: self.search_tasks())
         search_entry = ttk.Entry(
             header,
-            textvariable=search_var,
+            textvariable=self.search_var,
             style="Modern.TEntry",
             width=40
         )
+        search_entry.bind("<FocusIn>", lambda event: self.store.prepare_search())
         search_entry.pack(side="right")
         
         # Task input section with modern styling
@@ -720,6 +3097,57 @@ class ModernToDoList:
             command=self.add_task
         )
         add_btn.pack(side="left", padx=5)
+        
+        # Container the category and dashboard pages are packed into
+        self.content_frame = ttk.Frame(content, style="Modern.TFrame")
+        self.content_frame.pack(fill="both", expand=True)
+
+    def create_pages(self):
+        # Pages are built by get_page the first time they are needed
+        self.pages = {}  # Name -> page, least recently shown first
+        self.page_before_search = "My Day"
+
+    def get_page(self, name):
+        # Build the page on first use and mark it as the most recent
+        page = self.pages.pop(name, None)
+        if page is None:
+            if name == "Dashboard":
+                page = DashboardPage(self.content_frame, self)
+            elif name == "Search":
+                # Results of the header search
+                page = SearchPage(self.content_frame, self)
+            else:
+                page = CategoryPage(self.content_frame, name, self)
+        self.pages[name] = page
+        return page
+
+    def drop_old_pages(self):
+        # Destroy the pages shown longest ago, the current page is the newest
+        if PAGE_CACHE_SIZE is None:
+            return
+        while len(self.pages) > max(PAGE_CACHE_SIZE, 1):
+            self.pages.pop(next(iter(self.pages))).destroy()
+
+    def search_tasks(self):
+        page = self.get_page("Search")
+        page.query = self.search_var.get().strip()
+        if page.query:
+            if self.current_page != "Search":
+                self.page_before_search = self.current_page
+                self.show_page("Search")
+            else:
+                page.refresh_tasks()
+        elif self.current_page == "Search":
+            # Clearing the search goes back to where it started
+            self.show_page(self.page_before_search)
+
+    def add_task(self):
+        # The header entry adds to whichever category page is showing
+        page = self.pages.get(self.current_page)
+        if isinstance(page, CategoryPage) and not isinstance(page, SearchPage):
+            page.task_var.set(self.task_var.get())
+            page.add_task()
+            self.task_var.set("")
 
     def create_task_list(self):
         # Configure modern Treeview style
@@ -764,35 +3192,130 @@ class ModernToDoList:
             )
 
     def show_page(self, category):
-        # Hide all pages
-        for page in self.pages.values():
-            page.pack_forget()
+        # Hide the page on screen, it is the only one packed
+        current = self.pages.get(self.current_page)
+        if current is not None:
+            current.pack_forget()
             
-        # Show selected page
-        self.pages[category].pack(fill="both", expand=True)
-        self.pages[category].refresh_tasks()
+        # Show selected page, a new dashboard is already up to date
+        built = category in self.pages
+        page = self.get_page(category)
+        self.current_page = category
+        page.pack(fill="both", expand=True)
+        if category != "Dashboard":
+            page.refresh_tasks()
+        elif built:
+            page.refresh_dashboard()
+        self.drop_old_pages()
         
     def load_tasks(self):
+        self.task_loader = None
         try:
-            with open("tasks.json", "r") as file:
-                tasks = json.load(file)
-                # Ensure all tasks have required fields
-                for task in tasks:
-                    if "category" not in task:
-                        task["category"] = "My Day"
-                    if "status" not in task:
-                        task["status"] = "Pending"
-                return tasks
-        except FileNotFoundError:
-            return []
+            if hasattr(self.store, "load_batches"):
+                # Only wait for the first batch, the rest loads after the
+                # window is up
+                self.task_loader = self.store.load_batches()
+                next(self.task_loader, None)
+            else:
+                self.store.load()
         except Exception as e:
+            self.task_loader = None
             messagebox.showerror("Error", f"Error loading tasks: {str(e)}")
-            return []
+
+    def load_next_batch(self):
+        try:
+            batch = next(self.task_loader, None)
+        except Exception as e:
+            self.task_loader = None
+            messagebox.showerror("Error", f"Error loading tasks: {str(e)}")
+            return
+            
+        page = self.pages.get(self.current_page)
+        if batch is None:
+            # Everything is loaded, the dashboard needs full numbers
+            self.task_loader = None
+            archived = self.archive_old_tasks()
+            if isinstance(page, DashboardPage):
+                page.refresh_dashboard()
+            elif archived:
+                page.refresh_tasks()
+            return
+            
+        if isinstance(page, CategoryPage):
+            page.append_tasks(batch)
+        self.root.after(1, self.load_next_batch)
+            
+    def poll_store(self):
+        # Only the page on screen is merged, the others refresh when shown
+        if self.task_loader is None:
+            try:
+                changes = self.store.poll_changes()
+            except (OSError, ValueError, sqlite3.Error):
+                # Try again on the next tick
+                changes = []
+            page = self.pages.get(self.current_page)
+            if isinstance(page, DashboardPage):
+                if changes != []:
+                    page.refresh_dashboard()
+            elif changes is None:
+                page.refresh_tasks()
+            elif changes:
+                page.apply_changes(changes)
+        self.root.after(STORE_POLL_MS, self.poll_store)
+
+    def archive_old_tasks(self):
+        # Once a day, move long-completed tasks from the store to the archive
+        today = datetime.now().strftime("%Y-%m-%d")
+        if not self.archive.is_due(today):
+            return 0
+        cutoff = (datetime.now() - timedelta(days=ARCHIVE_AFTER_DAYS)).strftime("%Y-%m-%d")
+        try:
+            # One instance at a time, one that waited finds the pass done
+            with self.archive.lock:
+                self.archive.reload()
+                if not self.archive.is_due(today):
+                    return 0
+                old_tasks = self.store.completed_before(cutoff)
+                # Archive first, a crash in between then duplicates rather
+                # than loses; the duplicates are only deleted next time
+                self.archive.archive([task for task in old_tasks if not self.archive.has(task)], today)
+                self.store.delete_many(old_tasks)
+                return len(old_tasks)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error archiving tasks: {str(e)}")
+            return 0
+
+    def category_status_counts(self):
+        # Working set plus archived tasks
+        counts = self.store.category_status_counts()
+        for key, count in self.archive.category_status_counts().items():
+            counts[key] = counts.get(key, 0) + count
+        return counts
+
+    def count_due(self, due_date):
+        return self.store.count_due(due_date) + self.archive.count_due(due_date)
+
+    def count_due_between(self, start, end):
+        return self.store.count_due_between(start, end) + self.archive.count_due_between(start, end)
+
+    def count_overdue(self, today):
+        # Archived tasks are all completed, so only the store can have any
+        return self.store.count_overdue(today)
+
+    def record_task_change(self, op, task):
+        # Hand a single change to the store instead of saving everything
+        try:
+            getattr(self.store, op)(task)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error saving tasks: {str(e)}")
+            
+    def on_close(self):
+        self.store.close()
+        self.root.destroy()
             
     def save_tasks(self):
         try:
-            with open("tasks.json", "w") as file:
-                json.dump(self.tasks, file, indent=4)
+            self.store.save()
         except Exception as e:
             messagebox.showerror("Error", f"Error saving tasks: {str(e)}")
 
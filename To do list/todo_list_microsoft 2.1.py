@@ -240,7 +240,7 @@ class CategoryPage(ttk.Frame):
                     "created_date": datetime.now().strftime("%Y-%m-%d %H:%M")
                 }
                 
-                self.main_app.tasks.append(new_task)
+                self.main_app.add_task_record(new_task)
                 self.main_app.save_tasks()
                 self.refresh_tasks()
                 self.task_var.set("")
@@ -252,17 +252,12 @@ class CategoryPage(ttk.Frame):
             messagebox.showwarning("Invalid Input", "Please enter a task!")
             
     def complete_task(self, item):
-        values = self.task_tree.item(item)['values']
-        task_name = values[1]  # Task is now in second column
-        
-        for task in self.main_app.tasks:
-            if (task["category"] == self.category_name and 
-                task["task"] == task_name and
-                task["status"] != "Completed"):
-                task["status"] = "Completed"
-                self.main_app.save_tasks()
-                self.refresh_tasks()
-                break
+        # Row iids are task ids
+        task = self.main_app.task_index.get(int(item))
+        if task is not None and task["status"] != "Completed":
+            task["status"] = "Completed"
+            self.main_app.save_tasks()
+            self.refresh_tasks()
             
     def edit_task(self):
         selected = self.task_tree.selection()
@@ -290,12 +285,10 @@ class CategoryPage(ttk.Frame):
             due_date.pack(pady=5)
             
             def save_changes():
-                for task in self.main_app.tasks:
-                    if (task["category"] == self.category_name and 
-                        task["task"] == values[1]):
-                        task["task"] = task_entry.get()
-                        task["due_date"] = due_date.get_date().strftime("%Y-%m-%d")
-                        break
+                task = self.main_app.task_index.get(int(item))
+                if task is not None:
+                    task["task"] = task_entry.get()
+                    task["due_date"] = due_date.get_date().strftime("%Y-%m-%d")
                 self.main_app.save_tasks()
                 self.refresh_tasks()
                 edit_window.destroy()
@@ -311,13 +304,7 @@ class CategoryPage(ttk.Frame):
         selected = self.task_tree.selection()
         if selected:
             if messagebox.askyesno("Confirm Delete", "Delete this task?"):
-                item = selected[0]
-                values = self.task_tree.item(item)['values']
-                self.main_app.tasks = [
-                    task for task in self.main_app.tasks 
-                    if not (task["category"] == self.category_name and 
-                           task["task"] == values[1])
-                ]
+                self.main_app.remove_task_record(int(selected[0]))
                 self.main_app.save_tasks()
                 self.refresh_tasks()
                 
@@ -350,7 +337,7 @@ class CategoryPage(ttk.Frame):
                     task.get("priority", "Normal"),
                     task.get("status", "Pending")
                 )
-                self.task_tree.insert("", "end", values=values)
+                self.task_tree.insert("", "end", iid=str(task["id"]), values=values)
 
             # Add completed tasks to completed tree if in My Day category
             if hasattr(self, 'completed_tree'):
@@ -362,7 +349,7 @@ class CategoryPage(ttk.Frame):
                         task.get("priority", "Normal"),
                         task.get("status", "Completed")
                     )
-                    self.completed_tree.insert("", "end", values=values)
+                    self.completed_tree.insert("", "end", iid=str(task["id"]), values=values)
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error loading tasks: {str(e)}")
@@ -576,8 +563,10 @@ class ModernToDoList:
         self.root.title("Modern Task Manager")
         self.root.geometry("1200x800")
         
-        # Initialize tasks list
+        # Initialize tasks list, with an index from task id to task
         self.tasks = self.load_tasks()
+        self.task_index = {task["id"]: task for task in self.tasks}
+        self.next_id = max(self.task_index, default=0) + 1
         self.current_category = "My Day"
         
         # Apply modern styles
@@ -739,7 +728,7 @@ class ModernToDoList:
                 "status": "Pending"
             }
             
-            self.tasks.append(new_task)
+            self.add_task_record(new_task)
             self.save_tasks()
             self.refresh_task_list()
             self.task_var.set("")
@@ -753,9 +742,8 @@ class ModernToDoList:
     def complete_task(self):
         selected = self.task_tree.selection()
         if selected:
-            item = selected[0]
-            task_idx = self.task_tree.index(item)
-            self.tasks[task_idx]["status"] = "Completed"
+            # Row iids are task ids
+            self.task_index[int(selected[0])]["status"] = "Completed"
             self.save_tasks()
             self.refresh_task_list()
             
@@ -763,9 +751,7 @@ class ModernToDoList:
         selected = self.task_tree.selection()
         if selected:
             if messagebox.askyesno("Confirm", "Delete this task?"):
-                item = selected[0]
-                task_idx = self.task_tree.index(item)
-                self.tasks.pop(task_idx)
+                self.remove_task_record(int(selected[0]))
                 self.save_tasks()
                 self.refresh_task_list()
                 
@@ -781,14 +767,32 @@ class ModernToDoList:
                     task["priority"],
                     task["status"]
                 )
-                self.task_tree.insert("", "end", values=values)
+                self.task_tree.insert("", "end", iid=str(task["id"]), values=values)
+                
+    def add_task_record(self, task):
+        task["id"] = self.next_id
+        self.next_id += 1
+        self.tasks.append(task)
+        self.task_index[task["id"]] = task
+        
+    def remove_task_record(self, task_id):
+        task = self.task_index.pop(task_id, None)
+        if task is not None:
+            self.tasks.remove(task)
                 
     def load_tasks(self):
         try:
             with open("tasks.json", "r") as file:
-                return json.load(file)
+                tasks = json.load(file)
         except FileNotFoundError:
             return []
+        # Older files have no task ids, number them in file order
+        next_id = max((task["id"] for task in tasks if "id" in task), default=0) + 1
+        for task in tasks:
+            if "id" not in task:
+                task["id"] = next_id
+                next_id += 1
+        return tasks
             
     def save_tasks(self):
         with open("tasks.json", "w") as file:
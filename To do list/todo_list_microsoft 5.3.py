@@ -17,6 +17,7 @@ class WeeklyTaskTracker:
         # Initialize tasks and history
         self.tasks = self.load_tasks()
         self.task_history = []
+        self.completion_times = []  # Epoch seconds of each history entry
         self.load_task_history()
         
         # Apply modern styles
@@ -249,6 +250,14 @@ class WeeklyTaskTracker:
         except Exception as e:
             print(f"Error loading task history: {str(e)}")
             self.task_history = []
+        # Parse every completion date once here instead of on each query
+        self.completion_times = [self.parse_completion_time(entry) for entry in self.task_history]
+            
+    def parse_completion_time(self, entry):
+        try:
+            return datetime.strptime(entry["completed_date"], "%Y-%m-%d %H:%M:%S").timestamp()
+        except (KeyError, TypeError, ValueError):
+            return None
             
     def save_task_history(self):
         """Save task completion history to file"""
@@ -260,14 +269,16 @@ class WeeklyTaskTracker:
             
     def add_to_history(self, task):
         """Add completed task to history"""
+        now = datetime.now()
         history_entry = {
             "task": task["task"],
             "category": task["category"],
-            "completed_date": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "completed_date": now.strftime("%Y-%m-%d %H:%M:%S"),
             "due_date": task.get("due_date", ""),
             "priority": task.get("priority", "Normal")
         }
         self.task_history.append(history_entry)
+        self.completion_times.append(now.replace(microsecond=0).timestamp())
         self.save_task_history()
         
     def complete_task(self, task_index):
@@ -316,18 +327,12 @@ class WeeklyTaskTracker:
         if not self.task_history:
             return []
             
-        current_date = datetime.now()
-        recent_tasks = []
-        
-        for entry in self.task_history:
-            completed_date = datetime.strptime(
-                entry["completed_date"],
-                "%Y-%m-%d %H:%M:%S"
-            )
-            if (current_date - completed_date).days <= days:
-                recent_tasks.append(entry)
-                
-        return recent_tasks
+        # Less than days + 1 whole days ago, the same as timedelta.days <= days
+        cutoff = datetime.now().timestamp() - (days + 1) * 86400
+        return [
+            entry for entry, completed_time in zip(self.task_history, self.completion_times)
+            if completed_time is not None and completed_time > cutoff
+        ]
 
 if __name__ == "__main__":
     root = tk.Tk()
@@ -1,5 +1,6 @@
 import tkinter as tk
-from tkinter import ttk
+from tkinter import ttk, messagebox
+import tkinter.font as tkfont
 from datetime import datetime, timedelta
 from tkcalendar import DateEntry
 import matplotlib.pyplot as plt
@@ -7,23 +8,165 @@ from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import json
 from datetime import datetime
 import numpy as np
+import os
+import queue
+import threading
+from bisect import bisect_left, bisect_right
+
+# How often the Tk thread checks for history write errors
+SAVE_ERROR_POLL_MS = 500
+
+class HistoryWriter:
+    """Writes task history to disk on a background thread.
+
+    Saves only replace the pending snapshot of a file, so a burst of
+    checkbox clicks turns into a single write. The thread writes at most
+    once per ``interval`` seconds; flush() writes whatever is pending right
+    away.
+
+    A failed write stays pending and is tried again with the next save.
+    The thread keeps running and puts the error on ``errors``, once until a
+    write succeeds again; the Tk thread polls that queue.
+    """
+
+    def __init__(self, interval=1.0):
+        self.interval = interval
+        self.errors = queue.Queue()  # Write errors for the Tk thread to show
+        self.failing = False  # The last write failed and was reported
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = threading.Event()
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    def submit(self, path, data):
+        # data must not be changed by the caller afterwards
+        with self.lock:
+            self.pending[path] = data
+        self.wakeup.set()
+
+    def run(self):
+        while not self.stopping.is_set():
+            self.wakeup.wait()
+            self.wakeup.clear()
+            try:
+                self.flush()
+                self.failing = False
+            except Exception as e:
+                # close() flushes again and raises the error itself
+                if not self.failing and not self.stopping.is_set():
+                    self.failing = True
+                    self.errors.put(e)
+            # Rate limit, but wake straight away when closing
+            self.stopping.wait(self.interval)
+
+    def flush(self):
+        with self.write_lock:
+            with self.lock:
+                pending, self.pending = self.pending, {}
+            failed, error = {}, None
+            for path, data in pending.items():
+                temp_path = path + ".tmp"
+                try:
+                    with open(temp_path, 'w') as f:
+                        json.dump(data, f)
+                    os.replace(temp_path, path)
+                except Exception as e:
+                    failed[path] = data
+                    error = error or e
+            if failed:
+                # Put back what was not written, unless saved again meanwhile
+                with self.lock:
+                    failed.update(self.pending)
+                    self.pending = failed
+                raise error
+
+    def close(self):
+        self.stopping.set()
+        self.wakeup.set()
+        self.thread.join()
+        self.flush()
+
+class WeekHistoryStore:
+    """Task history kept as one small JSON file per Week_%Y_%W key.
+
+    Saving a week only rewrites that week's file, and a week is read from
+    disk the first time something asks for it, so startup just lists the
+    folder.
+    """
+
+    def __init__(self, writer, folder='task_history', legacy_path='task_history.json'):
+        self.writer = writer
+        self.folder = folder
+        self.weeks = {}
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+            self.import_legacy(legacy_path)
+        self.week_keys = sorted(name[:-5] for name in os.listdir(folder) if name.endswith('.json'))
+
+    def import_legacy(self, legacy_path):
+        # Split the old single-file history into per-week files once
+        try:
+            with open(legacy_path, 'r') as f:
+                history = json.load(f)
+        except FileNotFoundError:
+            return
+        for week_key, week_data in history.items():
+            with open(self.path(week_key), 'w') as f:
+                json.dump(week_data, f)
+
+    def path(self, week_key):
+        return os.path.join(self.folder, f"{week_key}.json")
+
+    def keys(self):
+        return list(self.week_keys)
+
+    def keys_between(self, first_key, last_key):
+        # Keys sort by year and then zero-padded week, so a range is two bisections
+        return self.week_keys[bisect_left(self.week_keys, first_key):bisect_right(self.week_keys, last_key)]
+
+    def get(self, week_key):
+        if week_key not in self.weeks:
+            with open(self.path(week_key), 'r') as f:
+                self.weeks[week_key] = json.load(f)
+        return self.weeks[week_key]
+
+    def put(self, week_key, week_data):
+        if week_key not in self.week_keys:
+            self.week_keys.append(week_key)
+            self.week_keys.sort()
+        self.weeks[week_key] = week_data
+        self.writer.submit(self.path(week_key), week_data)
+
+# Number of days ticked in each 7-bit week mask
+DAYS_DONE = [bin(mask).count("1") for mask in range(1 << 7)]
 
 class WeeklyTaskTracker:
-    def __init__(self, root):
+    def __init__(self, root, save_interval=1.0):
         self.root = root
         self.root.title("Weekly Task Tracker")
         self.root.geometry("1400x800")  # Increased width for dashboard
         
         # Initialize task history
-        self.task_history = {}
+        self.history_writer = HistoryWriter(save_interval)
+        self.check_save_errors()
         self.load_task_history()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
         
         # Initialize task counter and lists
         self.task_count = 0
-        self.task_vars = []  # Store checkbox variables for each task
+        self.task_masks = []  # One bit per day for each task, bit 0 is Monday
+        self.checked_total = 0  # Ticked days across all tasks
+        self.task_vars = []  # Checkbox variables, these only mirror task_masks
+        self.completion = np.zeros((16, 7), dtype=bool)  # Rows x days, also mirrors task_masks
+        self.has_description = np.zeros(16, dtype=bool)  # Rows whose task entry is filled in
+        self.task_descriptions = []  # Text of each row's task entry
         self.progress_labels = []  # Store progress labels
         self.task_reward_pairs = []  # Store task-reward pairs
         self.task_names = []  # Store task names
+        self.history_range = None  # First and last week key picked in the header, None for all weeks
         
         # Apply modern styles
         self.apply_styles()
@@ -182,101 +325,89 @@ class WeeklyTaskTracker:
         )
         history_label.pack(fill="x", pady=(0, 10))
 
-        # Create scrollable history view
-        history_canvas = tk.Canvas(
-            self.history_page,
-            bg=self.colors['surface'],
-            highlightthickness=0
-        )
-        scrollbar = ttk.Scrollbar(self.history_page, orient="vertical", command=history_canvas.yview)
-        self.history_content = ttk.Frame(history_canvas, style="Tracker.TFrame")
-
-        history_canvas.configure(yscrollcommand=scrollbar.set)
-
-        scrollbar.pack(side="right", fill="y")
-        history_canvas.pack(side="left", fill="both", expand=True)
-        history_canvas.create_window((0, 0), window=self.history_content, anchor="nw", width=history_canvas.winfo_width())
-
-        self.history_content.bind("<Configure>", lambda e: history_canvas.configure(scrollregion=history_canvas.bbox("all")))
-        
+        # Scrollable history view, only the weeks in view have widgets
+        self.history_view = HistoryView(self.history_page, self.task_history)
+        self.history_view.pack(fill="both", expand=True)
         self.display_task_history()
 
     def save_current_week(self):
         week_data = {
             'tasks': [],
-            'progress': float(self.overall_progress_label.cget("text").split(":")[1].strip('%')),
+            'progress': float(self.overall_percentage()),
             'date': datetime.now().strftime('%Y-%m-%d')
         }
         
-        for i, row_vars in enumerate(self.task_vars):
-            task_text = self.grid_frame.grid_slaves(row=i+1, column=0)[0].get()
-            task_progress = float(self.progress_labels[i].cget("text").strip('%'))
+        for task_text, mask in zip(self.task_descriptions, self.task_masks):
             week_data['tasks'].append({
                 'description': task_text,
-                'progress': task_progress,
-                'daily_completion': [var.get() for var in row_vars]
+                'progress': float(int((DAYS_DONE[mask] / 7) * 100)),
+                'daily_completion': [bool(mask >> day & 1) for day in range(7)]
             })
             
         week_key = f"Week_{datetime.now().strftime('%Y_%W')}"
-        self.task_history[week_key] = week_data
-        self.save_task_history()
-        self.display_task_history()
+        # Only this week's record is written, older weeks stay untouched
+        self.task_history.put(week_key, week_data)
+        if week_key in self.history_view.keys:
+            # Only the block showing this week is refilled, if it is in view
+            self.history_view.render()
+        else:
+            self.display_task_history()
 
     def load_task_history(self):
+        self.task_history = WeekHistoryStore(self.history_writer)
+
+    def flush(self):
+        self.history_writer.flush()
+
+    def check_save_errors(self):
+        # The writer thread never calls Tk; its errors are shown from here
         try:
-            with open('task_history.json', 'r') as f:
-                self.task_history = json.load(f)
-        except FileNotFoundError:
-            self.task_history = {}
+            error = self.history_writer.errors.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            messagebox.showerror("Error", f"Error saving task history: {str(error)}")
+        self.root.after(SAVE_ERROR_POLL_MS, self.check_save_errors)
 
-    def save_task_history(self):
-        with open('task_history.json', 'w') as f:
-            json.dump(self.task_history, f)
+    def on_close(self):
+        # Make sure the last changes reach the disk before quitting
+        try:
+            self.history_writer.close()
+        except Exception as e:
+            messagebox.showerror("Error", f"Error saving task history: {str(e)}")
+        self.root.destroy()
 
     def display_task_history(self):
-        # Clear existing history display
-        for widget in self.history_content.winfo_children():
-            widget.destroy()
-
-        # Display each week's history
-        for week_key, week_data in sorted(self.task_history.items(), reverse=True):
-            week_frame = ttk.Frame(self.history_content, style="Tracker.TFrame")
-            week_frame.pack(fill="x", pady=5)
+        # Newest weeks first, records are read as they scroll into view
+        if self.history_range is None:
+            keys = self.task_history.keys()[::-1]
+        else:
+            keys = self.task_history.keys_between(*self.history_range)[::-1]
+        self.history_view.set_keys(keys)
 
-            week_label = ttk.Label(
-                week_frame,
-                text=f"{week_key} ({week_data['date']})",
-                style="History.TLabel"
-            )
-            week_label.pack(anchor="w")
+    def toggle_day(self, row, day):
+        # The checkbox has already flipped its variable, flip the matching bit
+        mask = self.task_masks[row-1] ^ (1 << day)
+        self.task_masks[row-1] = mask
+        self.checked_total += 1 if mask >> day & 1 else -1
+        self.completion[row-1, day] = mask >> day & 1
+        self.update_progress(row)
 
-            progress_label = ttk.Label(
-                week_frame,
-                text=f"Overall Progress: {week_data['progress']}%",
-                style="History.TLabel"
-            )
-            progress_label.pack(anchor="w")
+    def update_description(self, row, text):
+        self.task_descriptions[row-1] = text
+        self.has_description[row-1] = bool(text)
 
-            for task in week_data['tasks']:
-                if task['description']:  # Only show tasks with descriptions
-                    task_label = ttk.Label(
-                        week_frame,
-                        text=f"• {task['description']}: {task['progress']}%",
-                        style="History.TLabel"
-                    )
-                    task_label.pack(anchor="w", padx=(20, 0))
+    def overall_percentage(self):
+        total_tasks = len(self.task_masks) * 7  # Total possible checkboxes
+        return int((self.checked_total / total_tasks) * 100) if total_tasks else 0
 
     def update_progress(self, row):
         # Update individual task progress
-        checked_count = sum(1 for var in self.task_vars[row-1] if var.get())
-        percentage = int((checked_count / 7) * 100)
+        percentage = int((DAYS_DONE[self.task_masks[row-1]] / 7) * 100)
         self.progress_labels[row-1].configure(text=f"{percentage}%")
         
         # Update overall progress
-        total_tasks = len(self.task_vars) * 7  # Total possible checkboxes
-        total_checked = sum(sum(1 for var in row if var.get()) for row in self.task_vars)
-        overall_percentage = int((total_checked / total_tasks) * 100)
-        self.overall_progress_label.configure(text=f"Overall Progress: {overall_percentage}%")
+        self.overall_progress_label.configure(text=f"Overall Progress: {self.overall_percentage()}%")
         
         # Update dashboard if progress page is visible
         if self.progress_page.winfo_ismapped():
@@ -306,9 +437,10 @@ class WeeklyTaskTracker:
             width=12,
             background=self.colors['surface'],
             foreground=self.colors['text'],
-            borderwidth=2,
-            command=self.update_date_info
+            borderwidth=2
         )
+        # DateEntry drops a command option, so listen for its selection event
+        self.start_date_picker.bind("<<DateEntrySelected>>", lambda event: self.update_date_info())
         self.start_date_picker.pack(side="left", padx=(0, 10))
         
         # End date
@@ -324,9 +456,9 @@ class WeeklyTaskTracker:
             width=12,
             background=self.colors['surface'],
             foreground=self.colors['text'],
-            borderwidth=2,
-            command=self.update_date_info
+            borderwidth=2
         )
+        self.end_date_picker.bind("<<DateEntrySelected>>", lambda event: self.update_date_info())
         self.end_date_picker.pack(side="left")
         
         # Month and week labels
@@ -381,6 +513,12 @@ class WeeklyTaskTracker:
     def update_date_info(self):
         self.month_label.configure(text=self.get_month_text())
         self.week_label.configure(text=self.get_week_text())
+        # Show only the history weeks inside the picked range
+        self.history_range = (
+            self.start_date_picker.get_date().strftime('Week_%Y_%W'),
+            self.end_date_picker.get_date().strftime('Week_%Y_%W')
+        )
+        self.display_task_history()
 
     def create_task_grid(self):
         self.grid_frame = ttk.Frame(self.tracker_frame, style="Tracker.TFrame")
@@ -397,11 +535,20 @@ class WeeklyTaskTracker:
             label.grid(row=0, column=i, sticky="nsew", padx=1, pady=1)
 
     def add_task_row(self):
-        row = len(self.task_vars) + 1
+        row = len(self.task_masks) + 1
         
+        # Grow the dashboard arrays by doubling so adding a row stays cheap
+        if row > len(self.has_description):
+            self.completion = np.concatenate([self.completion, np.zeros_like(self.completion)])
+            self.has_description = np.concatenate([self.has_description, np.zeros_like(self.has_description)])
+        self.task_descriptions.append("")
+
         # Task description
+        task_text = tk.StringVar()
+        task_text.trace_add("write", lambda *args, r=row: self.update_description(r, task_text.get()))
         task_entry = ttk.Entry(
             self.grid_frame,
+            textvariable=task_text,
             font=('Segoe UI', 10),
             style='Task.TEntry'
         )
@@ -414,11 +561,12 @@ class WeeklyTaskTracker:
             checkbox = ttk.Checkbutton(
                 self.grid_frame,
                 variable=var,
-                command=lambda r=row: self.update_progress(r)
+                command=lambda r=row, d=col-1: self.toggle_day(r, d)
             )
             checkbox.grid(row=row, column=col, sticky="nsew", padx=1, pady=1)
             row_vars.append(var)
         self.task_vars.append(row_vars)
+        self.task_masks.append(0)
         
         # Progress label
         progress_label = ttk.Label(
@@ -523,15 +671,14 @@ class WeeklyTaskTracker:
         self.ax2.clear()
         self.ax3.clear()
         
+        # Only tasks with descriptions are charted
+        rows = len(self.task_masks)
+        described = self.has_description[:rows]
+        done = self.completion[:rows][described]
+        task_names = [self.task_descriptions[i] for i in np.flatnonzero(described)]
+
         # Update progress chart
-        task_names = []
-        progress = []
-        for i, row_vars in enumerate(self.task_vars):
-            task_text = self.grid_frame.grid_slaves(row=i+1, column=0)[0].get()
-            if task_text:  # Only show tasks with descriptions
-                task_names.append(task_text)
-                checked = sum(1 for var in row_vars if var.get())
-                progress.append((checked / 7) * 100)
+        progress = done.sum(axis=1) / 7 * 100
         
         if task_names:  # Only create chart if there are tasks
             self.ax1.barh(task_names, progress, color=self.colors['primary'])
@@ -540,16 +687,10 @@ class WeeklyTaskTracker:
         
         # Update trend chart
         days = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
-        daily_completion = []
-        for day in range(7):
-            tasks_with_description = sum(1 for i, row in enumerate(self.task_vars) 
-                                       if self.grid_frame.grid_slaves(row=i+1, column=0)[0].get())
-            if tasks_with_description > 0:
-                completed = sum(1 for i, row in enumerate(self.task_vars) 
-                              if row[day].get() and self.grid_frame.grid_slaves(row=i+1, column=0)[0].get())
-                daily_completion.append((completed / tasks_with_description) * 100)
-            else:
-                daily_completion.append(0)
+        if len(done):
+            daily_completion = done.mean(axis=0) * 100
+        else:
+            daily_completion = np.zeros(7)
         
         self.ax2.plot(days, daily_completion, color=self.colors['primary'],
                      marker='o', linewidth=2)